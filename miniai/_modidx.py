@@ -8,17 +8,23 @@ d = { 'settings': { 'branch': 'main',
   'syms': { 'miniai.accel': { 'miniai.accel.Adam': ('accel_sgd.html#adam', 'miniai/accel.py'),
                               'miniai.accel.Adam.__init__': ('accel_sgd.html#adam.__init__', 'miniai/accel.py'),
                               'miniai.accel.Adam.opt_step': ('accel_sgd.html#adam.opt_step', 'miniai/accel.py'),
+                              'miniai.accel.Adam.step': ('accel_sgd.html#adam.step', 'miniai/accel.py'),
                               'miniai.accel.CosineAnneal': ('accel_sgd.html#cosineanneal', 'miniai/accel.py'),
                               'miniai.accel.ExponentialAnneal': ('accel_sgd.html#exponentialanneal', 'miniai/accel.py'),
                               'miniai.accel.LRScheduler': ('accel_sgd.html#lrscheduler', 'miniai/accel.py'),
                               'miniai.accel.LRScheduler.__init__': ('accel_sgd.html#lrscheduler.__init__', 'miniai/accel.py'),
                               'miniai.accel.LRScheduler.after_batch': ('accel_sgd.html#lrscheduler.after_batch', 'miniai/accel.py'),
                               'miniai.accel.LRScheduler.before_fit': ('accel_sgd.html#lrscheduler.before_fit', 'miniai/accel.py'),
+                              'miniai.accel.LRScheduler.load_state_dict': ('accel_sgd.html#lrscheduler.load_state_dict', 'miniai/accel.py'),
+                              'miniai.accel.LRScheduler.state_dict': ('accel_sgd.html#lrscheduler.state_dict', 'miniai/accel.py'),
                               'miniai.accel.LinearAnneal': ('accel_sgd.html#linearanneal', 'miniai/accel.py'),
                               'miniai.accel.SGD': ('accel_sgd.html#sgd', 'miniai/accel.py'),
                               'miniai.accel.SGD.__init__': ('accel_sgd.html#sgd.__init__', 'miniai/accel.py'),
+                              'miniai.accel.SGD.load_state_dict': ('accel_sgd.html#sgd.load_state_dict', 'miniai/accel.py'),
+                              'miniai.accel.SGD.lr_for': ('accel_sgd.html#sgd.lr_for', 'miniai/accel.py'),
                               'miniai.accel.SGD.opt_step': ('accel_sgd.html#sgd.opt_step', 'miniai/accel.py'),
                               'miniai.accel.SGD.reg_step': ('accel_sgd.html#sgd.reg_step', 'miniai/accel.py'),
+                              'miniai.accel.SGD.state_dict': ('accel_sgd.html#sgd.state_dict', 'miniai/accel.py'),
                               'miniai.accel.SGD.step': ('accel_sgd.html#sgd.step', 'miniai/accel.py'),
                               'miniai.accel.SGD.zero_grad': ('accel_sgd.html#sgd.zero_grad', 'miniai/accel.py'),
                               'miniai.accel.SingleBatch': ('accel_sgd.html#singlebatch', 'miniai/accel.py'),
@@ -57,6 +63,24 @@ d = { 'settings': { 'branch': 'main',
                                     'miniai.activations.append_stats': ('activations.html#append_stats', 'miniai/activations.py'),
                                     'miniai.activations.get_hist': ('activations.html#get_hist', 'miniai/activations.py'),
                                     'miniai.activations.get_min': ('activations.html#get_min', 'miniai/activations.py')},
+            'miniai.checkpoint': { 'miniai.checkpoint.CheckpointCB': ('checkpoint.html#checkpointcb', 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.__init__': ( 'checkpoint.html#checkpointcb.__init__',
+                                                                                'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB._write': ('checkpoint.html#checkpointcb._write', 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.after_batch': ( 'checkpoint.html#checkpointcb.after_batch',
+                                                                                   'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.after_fit': ( 'checkpoint.html#checkpointcb.after_fit',
+                                                                                 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.before_epoch': ( 'checkpoint.html#checkpointcb.before_epoch',
+                                                                                    'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.before_fit': ( 'checkpoint.html#checkpointcb.before_fit',
+                                                                                  'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.cleanup_fit': ( 'checkpoint.html#checkpointcb.cleanup_fit',
+                                                                                   'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.save': ('checkpoint.html#checkpointcb.save', 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.CheckpointCB.wait': ('checkpoint.html#checkpointcb.wait', 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.latest_checkpoint': ('checkpoint.html#latest_checkpoint', 'miniai/checkpoint.py'),
+                                   'miniai.checkpoint.to_host': ('checkpoint.html#to_host', 'miniai/checkpoint.py')},
             'miniai.conv': { 'miniai.conv.BottleneckBlock': ('conv.html#bottleneckblock', 'miniai/conv.py'),
                              'miniai.conv.BottleneckBlock.__init__': ('conv.html#bottleneckblock.__init__', 'miniai/conv.py'),
                              'miniai.conv.BottleneckBlock.forward': ('conv.html#bottleneckblock.forward', 'miniai/conv.py'),
@@ -72,17 +96,141 @@ d = { 'settings': { 'branch': 'main',
                              'miniai.conv.ResnetStem.__init__': ('conv.html#resnetstem.__init__', 'miniai/conv.py')},
             'miniai.core': { 'miniai.core.clean_gpu': ('core.html#clean_gpu', 'miniai/core.py'),
                              'miniai.core.clean_ipython_hist': ('core.html#clean_ipython_hist', 'miniai/core.py'),
-                             'miniai.core.clean_tb': ('core.html#clean_tb', 'miniai/core.py')},
+                             'miniai.core.clean_tb': ('core.html#clean_tb', 'miniai/core.py'),
+                             'miniai.core.device_mem_stats': ('core.html#device_mem_stats', 'miniai/core.py'),
+                             'miniai.core.host_rss': ('core.html#host_rss', 'miniai/core.py'),
+                             'miniai.core.tensor_bytes': ('core.html#tensor_bytes', 'miniai/core.py')},
             'miniai.datasets': { 'miniai.datasets.DataLoaders': ('datasets.html#dataloaders', 'miniai/datasets.py'),
                                  'miniai.datasets.DataLoaders.__init__': ('datasets.html#dataloaders.__init__', 'miniai/datasets.py'),
                                  'miniai.datasets.DataLoaders.from_dd': ('datasets.html#dataloaders.from_dd', 'miniai/datasets.py'),
                                  'miniai.datasets.collate_dict': ('datasets.html#collate_dict', 'miniai/datasets.py'),
-                                 'miniai.datasets.inplace': ('datasets.html#inplace', 'miniai/datasets.py')},
+                                 'miniai.datasets.inplace': ('datasets.html#inplace', 'miniai/datasets.py'),
+                                 'miniai.datasets.quadrants': ('datasets.html#quadrants', 'miniai/datasets.py')},
+            'miniai.distill': { 'miniai.distill.DistillCB': ('distill.html#distillcb', 'miniai/distill.py'),
+                                'miniai.distill.DistillCB.__init__': ('distill.html#distillcb.__init__', 'miniai/distill.py'),
+                                'miniai.distill.DistillCB.before_batch': ('distill.html#distillcb.before_batch', 'miniai/distill.py'),
+                                'miniai.distill.DistillDataset': ('distill.html#distilldataset', 'miniai/distill.py'),
+                                'miniai.distill.DistillDataset.__getitem__': ( 'distill.html#distilldataset.__getitem__',
+                                                                               'miniai/distill.py'),
+                                'miniai.distill.DistillDataset.__init__': ('distill.html#distilldataset.__init__', 'miniai/distill.py'),
+                                'miniai.distill.DistillDataset.__len__': ('distill.html#distilldataset.__len__', 'miniai/distill.py'),
+                                'miniai.distill.DistillDataset.view': ('distill.html#distilldataset.view', 'miniai/distill.py'),
+                                'miniai.distill.DistillLearner': ('distill.html#distilllearner', 'miniai/distill.py'),
+                                'miniai.distill.DistillLearner.__init__': ('distill.html#distilllearner.__init__', 'miniai/distill.py'),
+                                'miniai.distill.DistillLearner.get_loss': ('distill.html#distilllearner.get_loss', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore': ('distill.html#logitstore', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.__getstate__': ('distill.html#logitstore.__getstate__', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.__init__': ('distill.html#logitstore.__init__', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.__len__': ('distill.html#logitstore.__len__', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore._open': ('distill.html#logitstore._open', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.create': ('distill.html#logitstore.create', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.dataset': ('distill.html#logitstore.dataset', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.flush': ('distill.html#logitstore.flush', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.read': ('distill.html#logitstore.read', 'miniai/distill.py'),
+                                'miniai.distill.LogitStore.write': ('distill.html#logitstore.write', 'miniai/distill.py'),
+                                'miniai.distill.cache_teacher': ('distill.html#cache_teacher', 'miniai/distill.py'),
+                                'miniai.distill.random_crop_flip': ('distill.html#random_crop_flip', 'miniai/distill.py'),
+                                'miniai.distill.soft_target_loss': ('distill.html#soft_target_loss', 'miniai/distill.py')},
+            'miniai.early_stopping': { 'miniai.early_stopping.EarlyStoppingCB': ( 'early_stopping.html#earlystoppingcb',
+                                                                                  'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.__init__': ( 'early_stopping.html#earlystoppingcb.__init__',
+                                                                                           'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB._check_plateau': ( 'early_stopping.html#earlystoppingcb._check_plateau',
+                                                                                                 'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB._subset': ( 'early_stopping.html#earlystoppingcb._subset',
+                                                                                          'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB._track': ( 'early_stopping.html#earlystoppingcb._track',
+                                                                                         'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.after_batch': ( 'early_stopping.html#earlystoppingcb.after_batch',
+                                                                                              'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.after_full_epoch': ( 'early_stopping.html#earlystoppingcb.after_full_epoch',
+                                                                                                   'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.before_epoch': ( 'early_stopping.html#earlystoppingcb.before_epoch',
+                                                                                               'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.before_fit': ( 'early_stopping.html#earlystoppingcb.before_fit',
+                                                                                             'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.load_state_dict': ( 'early_stopping.html#earlystoppingcb.load_state_dict',
+                                                                                                  'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.EarlyStoppingCB.state_dict': ( 'early_stopping.html#earlystoppingcb.state_dict',
+                                                                                             'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.StopWhen': ('early_stopping.html#stopwhen', 'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.StopWhen.__init__': ( 'early_stopping.html#stopwhen.__init__',
+                                                                                    'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.StopWhen.__iter__': ( 'early_stopping.html#stopwhen.__iter__',
+                                                                                    'miniai/early_stopping.py'),
+                                       'miniai.early_stopping.StopWhen.__len__': ( 'early_stopping.html#stopwhen.__len__',
+                                                                                   'miniai/early_stopping.py')},
+            'miniai.ema': { 'miniai.ema.EMACB': ('ema.html#emacb', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.__init__': ('ema.html#emacb.__init__', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.after_batch': ('ema.html#emacb.after_batch', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.before_epoch': ('ema.html#emacb.before_epoch', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.before_fit': ('ema.html#emacb.before_fit', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.cleanup_epoch': ('ema.html#emacb.cleanup_epoch', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.decay_at': ('ema.html#emacb.decay_at', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.ema_model': ('ema.html#emacb.ema_model', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.load_state_dict': ('ema.html#emacb.load_state_dict', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.state_dict': ('ema.html#emacb.state_dict', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.swap': ('ema.html#emacb.swap', 'miniai/ema.py'),
+                            'miniai.ema.EMACB.update': ('ema.html#emacb.update', 'miniai/ema.py')},
+            'miniai.ensemble': { 'miniai.ensemble.Ensemble': ('ensemble.html#ensemble', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.Ensemble.__init__': ('ensemble.html#ensemble.__init__', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.Ensemble._call': ('ensemble.html#ensemble._call', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.Ensemble.forward': ('ensemble.html#ensemble.forward', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.Ensemble.models': ('ensemble.html#ensemble.models', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.Ensemble.train': ('ensemble.html#ensemble.train', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleLearner': ('ensemble.html#ensemblelearner', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleLearner.__init__': ( 'ensemble.html#ensemblelearner.__init__',
+                                                                               'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleLearner.fit': ('ensemble.html#ensemblelearner.fit', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleLearner.get_loss': ( 'ensemble.html#ensemblelearner.get_loss',
+                                                                               'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB': ('ensemble.html#ensemblemetricscb', 'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.__init__': ( 'ensemble.html#ensemblemetricscb.__init__',
+                                                                                 'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.after_batch': ( 'ensemble.html#ensemblemetricscb.after_batch',
+                                                                                    'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.after_epoch': ( 'ensemble.html#ensemblemetricscb.after_epoch',
+                                                                                    'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.before_epoch': ( 'ensemble.html#ensemblemetricscb.before_epoch',
+                                                                                     'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.before_full_epoch': ( 'ensemble.html#ensemblemetricscb.before_full_epoch',
+                                                                                          'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.columns': ( 'ensemble.html#ensemblemetricscb.columns',
+                                                                                'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.load_state_dict': ( 'ensemble.html#ensemblemetricscb.load_state_dict',
+                                                                                        'miniai/ensemble.py'),
+                                 'miniai.ensemble.EnsembleMetricsCB.state_dict': ( 'ensemble.html#ensemblemetricscb.state_dict',
+                                                                                   'miniai/ensemble.py')},
+            'miniai.grad_monitor': { 'miniai.grad_monitor.GradMonitorCB': ('grad_monitor.html#gradmonitorcb', 'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.__init__': ( 'grad_monitor.html#gradmonitorcb.__init__',
+                                                                                     'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB._ratios': ( 'grad_monitor.html#gradmonitorcb._ratios',
+                                                                                    'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.after_backward': ( 'grad_monitor.html#gradmonitorcb.after_backward',
+                                                                                           'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.before_fit': ( 'grad_monitor.html#gradmonitorcb.before_fit',
+                                                                                       'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.cleanup_batch': ( 'grad_monitor.html#gradmonitorcb.cleanup_batch',
+                                                                                          'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.cleanup_fit': ( 'grad_monitor.html#gradmonitorcb.cleanup_fit',
+                                                                                        'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.flush': ( 'grad_monitor.html#gradmonitorcb.flush',
+                                                                                  'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.grad_norms': ( 'grad_monitor.html#gradmonitorcb.grad_norms',
+                                                                                       'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.plot': ( 'grad_monitor.html#gradmonitorcb.plot',
+                                                                                 'miniai/grad_monitor.py'),
+                                     'miniai.grad_monitor.GradMonitorCB.summary': ( 'grad_monitor.html#gradmonitorcb.summary',
+                                                                                    'miniai/grad_monitor.py')},
             'miniai.initialisation': { 'miniai.initialisation.BatchNorm': ('initialisation.html#batchnorm', 'miniai/initialisation.py'),
                                        'miniai.initialisation.BatchNorm.__init__': ( 'initialisation.html#batchnorm.__init__',
                                                                                      'miniai/initialisation.py'),
+                                       'miniai.initialisation.BatchNorm.cached_scale_shift': ( 'initialisation.html#batchnorm.cached_scale_shift',
+                                                                                               'miniai/initialisation.py'),
                                        'miniai.initialisation.BatchNorm.forward': ( 'initialisation.html#batchnorm.forward',
                                                                                     'miniai/initialisation.py'),
+                                       'miniai.initialisation.BatchNorm.scale_shift': ( 'initialisation.html#batchnorm.scale_shift',
+                                                                                        'miniai/initialisation.py'),
                                        'miniai.initialisation.BatchNorm.update': ( 'initialisation.html#batchnorm.update',
                                                                                    'miniai/initialisation.py'),
                                        'miniai.initialisation.BatchTransform': ( 'initialisation.html#batchtransform',
@@ -116,6 +264,20 @@ d = { 'settings': { 'branch': 'main',
                                                                                   'miniai/initialisation.py'),
                                        'miniai.initialisation.xavier_init': ( 'initialisation.html#xavier_init',
                                                                               'miniai/initialisation.py')},
+            'miniai.latency': { 'miniai.latency.LatencyTable': ('latency.html#latencytable', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.__init__': ('latency.html#latencytable.__init__', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable._load_cache': ('latency.html#latencytable._load_cache', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable._save_cache': ('latency.html#latencytable._save_cache', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.measure': ('latency.html#latencytable.measure', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.measure_model': ( 'latency.html#latencytable.measure_model',
+                                                                               'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.model': ('latency.html#latencytable.model', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.predict': ('latency.html#latencytable.predict', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.search': ('latency.html#latencytable.search', 'miniai/latency.py'),
+                                'miniai.latency.LatencyTable.units': ('latency.html#latencytable.units', 'miniai/latency.py'),
+                                'miniai.latency._down': ('latency.html#_down', 'miniai/latency.py'),
+                                'miniai.latency.fine_rank': ('latency.html#fine_rank', 'miniai/latency.py'),
+                                'miniai.latency.model_units': ('latency.html#model_units', 'miniai/latency.py')},
             'miniai.learner': { 'miniai.learner.BaseLearner': ('learner.html#baselearner', 'miniai/learner.py'),
                                 'miniai.learner.BaseLearner.backward': ('learner.html#baselearner.backward', 'miniai/learner.py'),
                                 'miniai.learner.BaseLearner.get_loss': ('learner.html#baselearner.get_loss', 'miniai/learner.py'),
@@ -133,16 +295,27 @@ d = { 'settings': { 'branch': 'main',
                                 'miniai.learner.DeviceCB.before_fit': ('learner.html#devicecb.before_fit', 'miniai/learner.py'),
                                 'miniai.learner.LRFinderCB': ('learner.html#lrfindercb', 'miniai/learner.py'),
                                 'miniai.learner.LRFinderCB.__init__': ('learner.html#lrfindercb.__init__', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB._set_lr': ('learner.html#lrfindercb._set_lr', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB._update': ('learner.html#lrfindercb._update', 'miniai/learner.py'),
                                 'miniai.learner.LRFinderCB.after_batch': ('learner.html#lrfindercb.after_batch', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB.before_batch': ('learner.html#lrfindercb.before_batch', 'miniai/learner.py'),
                                 'miniai.learner.LRFinderCB.before_fit': ('learner.html#lrfindercb.before_fit', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB.cleanup_fit': ('learner.html#lrfindercb.cleanup_fit', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB.plot': ('learner.html#lrfindercb.plot', 'miniai/learner.py'),
+                                'miniai.learner.LRFinderCB.suggestion': ('learner.html#lrfindercb.suggestion', 'miniai/learner.py'),
                                 'miniai.learner.Learner': ('learner.html#learner', 'miniai/learner.py'),
                                 'miniai.learner.Learner.__init__': ('learner.html#learner.__init__', 'miniai/learner.py'),
                                 'miniai.learner.Learner._one_batch': ('learner.html#learner._one_batch', 'miniai/learner.py'),
                                 'miniai.learner.Learner._one_epoch': ('learner.html#learner._one_epoch', 'miniai/learner.py'),
+                                'miniai.learner.Learner._resume': ('learner.html#learner._resume', 'miniai/learner.py'),
+                                'miniai.learner.Learner._skip': ('learner.html#learner._skip', 'miniai/learner.py'),
                                 'miniai.learner.Learner.callback': ('learner.html#learner.callback', 'miniai/learner.py'),
                                 'miniai.learner.Learner.callback_context': ('learner.html#learner.callback_context', 'miniai/learner.py'),
                                 'miniai.learner.Learner.fit': ('learner.html#learner.fit', 'miniai/learner.py'),
+                                'miniai.learner.Learner.load_state_dict': ('learner.html#learner.load_state_dict', 'miniai/learner.py'),
                                 'miniai.learner.Learner.lr_find': ('learner.html#learner.lr_find', 'miniai/learner.py'),
+                                'miniai.learner.Learner.state_dict': ('learner.html#learner.state_dict', 'miniai/learner.py'),
+                                'miniai.learner.Learner.validate': ('learner.html#learner.validate', 'miniai/learner.py'),
                                 'miniai.learner.MetricsCB': ('learner.html#metricscb', 'miniai/learner.py'),
                                 'miniai.learner.MetricsCB.__init__': ('learner.html#metricscb.__init__', 'miniai/learner.py'),
                                 'miniai.learner.MetricsCB._log': ('learner.html#metricscb._log', 'miniai/learner.py'),
@@ -154,16 +327,223 @@ d = { 'settings': { 'branch': 'main',
                                 'miniai.learner.MetricsCB.before_fit': ('learner.html#metricscb.before_fit', 'miniai/learner.py'),
                                 'miniai.learner.MetricsCB.before_full_epoch': ( 'learner.html#metricscb.before_full_epoch',
                                                                                 'miniai/learner.py'),
+                                'miniai.learner.MetricsCB.columns': ('learner.html#metricscb.columns', 'miniai/learner.py'),
+                                'miniai.learner.MetricsCB.load_state_dict': ('learner.html#metricscb.load_state_dict', 'miniai/learner.py'),
+                                'miniai.learner.MetricsCB.state_dict': ('learner.html#metricscb.state_dict', 'miniai/learner.py'),
                                 'miniai.learner.MomentumLearner': ('learner.html#momentumlearner', 'miniai/learner.py'),
                                 'miniai.learner.MomentumLearner.__init__': ('learner.html#momentumlearner.__init__', 'miniai/learner.py'),
                                 'miniai.learner.MomentumLearner.zero_grad': ('learner.html#momentumlearner.zero_grad', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB': ('learner.html#progresscb', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB.__init__': ('learner.html#progresscb.__init__', 'miniai/learner.py'),
+                                'miniai.learner.ProgressCB._draw': ('learner.html#progresscb._draw', 'miniai/learner.py'),
+                                'miniai.learner.ProgressCB._flush': ('learner.html#progresscb._flush', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB._plot': ('learner.html#progresscb._plot', 'miniai/learner.py'),
+                                'miniai.learner.ProgressCB._record': ('learner.html#progresscb._record', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB.after_batch': ('learner.html#progresscb.after_batch', 'miniai/learner.py'),
+                                'miniai.learner.ProgressCB.after_epoch': ('learner.html#progresscb.after_epoch', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB.after_fit': ('learner.html#progresscb.after_fit', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB.before_epoch': ('learner.html#progresscb.before_epoch', 'miniai/learner.py'),
                                 'miniai.learner.ProgressCB.before_fit': ('learner.html#progresscb.before_fit', 'miniai/learner.py'),
+                                'miniai.learner.ProgressCB.cleanup_fit': ('learner.html#progresscb.cleanup_fit', 'miniai/learner.py'),
                                 'miniai.learner.get_device': ('learner.html#get_device', 'miniai/learner.py'),
+                                'miniai.learner.get_rng_state': ('learner.html#get_rng_state', 'miniai/learner.py'),
+                                'miniai.learner.set_rng_state': ('learner.html#set_rng_state', 'miniai/learner.py'),
                                 'miniai.learner.to_cpu': ('learner.html#to_cpu', 'miniai/learner.py')},
-            'miniai.test': {'miniai.test.test': ('test.html#test', 'miniai/test.py')}}}
+            'miniai.memory': { 'miniai.memory.MemoryTrackerCB': ('memory.html#memorytrackercb', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.__init__': ('memory.html#memorytrackercb.__init__', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB._check_growth': ( 'memory.html#memorytrackercb._check_growth',
+                                                                                'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB._record': ('memory.html#memorytrackercb._record', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.after_epoch': ('memory.html#memorytrackercb.after_epoch', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.after_fit': ('memory.html#memorytrackercb.after_fit', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.before_fit': ('memory.html#memorytrackercb.before_fit', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.cleanup_fit': ('memory.html#memorytrackercb.cleanup_fit', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.df': ('memory.html#memorytrackercb.df', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.holders': ('memory.html#memorytrackercb.holders', 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.orphaned_hooks': ( 'memory.html#memorytrackercb.orphaned_hooks',
+                                                                                 'miniai/memory.py'),
+                               'miniai.memory.MemoryTrackerCB.reclaim_mem': ('memory.html#memorytrackercb.reclaim_mem', 'miniai/memory.py'),
+                               'miniai.memory._owned_hooks': ('memory.html#_owned_hooks', 'miniai/memory.py'),
+                               'miniai.memory.model_hooks': ('memory.html#model_hooks', 'miniai/memory.py')},
+            'miniai.profiler': { 'miniai.profiler.ProfileHook': ('profiler.html#profilehook', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook.__init__': ('profiler.html#profilehook.__init__', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook._bwd_end': ('profiler.html#profilehook._bwd_end', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook._bwd_start': ('profiler.html#profilehook._bwd_start', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook._start': ('profiler.html#profilehook._start', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook.clock': ('profiler.html#profilehook.clock', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook.remove': ('profiler.html#profilehook.remove', 'miniai/profiler.py'),
+                                 'miniai.profiler.ProfileHook.reset': ('profiler.html#profilehook.reset', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler': ('profiler.html#profiler', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler.__init__': ('profiler.html#profiler.__init__', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler._table': ('profiler.html#profiler._table', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler.of_type': ('profiler.html#profiler.of_type', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler.run': ('profiler.html#profiler.run', 'miniai/profiler.py'),
+                                 'miniai.profiler.Profiler.to_json': ('profiler.html#profiler.to_json', 'miniai/profiler.py'),
+                                 'miniai.profiler._profile_fwd': ('profiler.html#_profile_fwd', 'miniai/profiler.py'),
+                                 'miniai.profiler.count_macs': ('profiler.html#count_macs', 'miniai/profiler.py'),
+                                 'miniai.profiler.profile_learner': ('profiler.html#profile_learner', 'miniai/profiler.py')},
+            'miniai.progressive': { 'miniai.progressive.ProgressiveResizeCB': ( 'progressive.html#progressiveresizecb',
+                                                                                'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.__init__': ( 'progressive.html#progressiveresizecb.__init__',
+                                                                                         'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB._size': ( 'progressive.html#progressiveresizecb._size',
+                                                                                      'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.after_fit': ( 'progressive.html#progressiveresizecb.after_fit',
+                                                                                          'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.before_batch': ( 'progressive.html#progressiveresizecb.before_batch',
+                                                                                             'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.before_epoch': ( 'progressive.html#progressiveresizecb.before_epoch',
+                                                                                             'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.before_fit': ( 'progressive.html#progressiveresizecb.before_fit',
+                                                                                           'miniai/progressive.py'),
+                                    'miniai.progressive.ProgressiveResizeCB.scale': ( 'progressive.html#progressiveresizecb.scale',
+                                                                                      'miniai/progressive.py'),
+                                    'miniai.progressive.linear_sched': ('progressive.html#linear_sched', 'miniai/progressive.py'),
+                                    'miniai.progressive.recalibrate_bn': ('progressive.html#recalibrate_bn', 'miniai/progressive.py')},
+            'miniai.pruning': { 'miniai.pruning.ChannelStats': ('pruning.html#channelstats', 'miniai/pruning.py'),
+                                'miniai.pruning.ChannelStats.__init__': ('pruning.html#channelstats.__init__', 'miniai/pruning.py'),
+                                'miniai.pruning.ChannelStats.before_fit': ('pruning.html#channelstats.before_fit', 'miniai/pruning.py'),
+                                'miniai.pruning.ChannelStats.cleanup_fit': ('pruning.html#channelstats.cleanup_fit', 'miniai/pruning.py'),
+                                'miniai.pruning.ChannelStats.scores': ('pruning.html#channelstats.scores', 'miniai/pruning.py'),
+                                'miniai.pruning._prune_in': ('pruning.html#_prune_in', 'miniai/pruning.py'),
+                                'miniai.pruning._prune_out': ('pruning.html#_prune_out', 'miniai/pruning.py'),
+                                'miniai.pruning._slice': ('pruning.html#_slice', 'miniai/pruning.py'),
+                                'miniai.pruning.append_channel_stats': ('pruning.html#append_channel_stats', 'miniai/pruning.py'),
+                                'miniai.pruning.bn_scores': ('pruning.html#bn_scores', 'miniai/pruning.py'),
+                                'miniai.pruning.compare_pruned': ('pruning.html#compare_pruned', 'miniai/pruning.py'),
+                                'miniai.pruning.prunable_pairs': ('pruning.html#prunable_pairs', 'miniai/pruning.py'),
+                                'miniai.pruning.prune_channels': ('pruning.html#prune_channels', 'miniai/pruning.py')},
+            'miniai.quantisation': { 'miniai.quantisation.calibrate': ('quantisation.html#calibrate', 'miniai/quantisation.py'),
+                                     'miniai.quantisation.compare_int8': ('quantisation.html#compare_int8', 'miniai/quantisation.py'),
+                                     'miniai.quantisation.fuse_conv_norm_act': ( 'quantisation.html#fuse_conv_norm_act',
+                                                                                 'miniai/quantisation.py'),
+                                     'miniai.quantisation.model_size': ('quantisation.html#model_size', 'miniai/quantisation.py'),
+                                     'miniai.quantisation.prepare_int8': ('quantisation.html#prepare_int8', 'miniai/quantisation.py'),
+                                     'miniai.quantisation.quantise': ('quantisation.html#quantise', 'miniai/quantisation.py'),
+                                     'miniai.quantisation.time_model': ('quantisation.html#time_model', 'miniai/quantisation.py')},
+            'miniai.serving': { 'miniai.serving.Client': ('serving.html#client', 'miniai/serving.py'),
+                                'miniai.serving.Client.__init__': ('serving.html#client.__init__', 'miniai/serving.py'),
+                                'miniai.serving.Client.close': ('serving.html#client.close', 'miniai/serving.py'),
+                                'miniai.serving.Client.connect': ('serving.html#client.connect', 'miniai/serving.py'),
+                                'miniai.serving.Client.metrics': ('serving.html#client.metrics', 'miniai/serving.py'),
+                                'miniai.serving.Client.predict': ('serving.html#client.predict', 'miniai/serving.py'),
+                                'miniai.serving.Client.request': ('serving.html#client.request', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher': ('serving.html#dynamicbatcher', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher.__init__': ('serving.html#dynamicbatcher.__init__', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher._loop': ('serving.html#dynamicbatcher._loop', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher._next_batch': ( 'serving.html#dynamicbatcher._next_batch',
+                                                                               'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher._run': ('serving.html#dynamicbatcher._run', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher.metrics': ('serving.html#dynamicbatcher.metrics', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher.predict': ('serving.html#dynamicbatcher.predict', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher.start': ('serving.html#dynamicbatcher.start', 'miniai/serving.py'),
+                                'miniai.serving.DynamicBatcher.stop': ('serving.html#dynamicbatcher.stop', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer': ('serving.html#inferenceserver', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.__init__': ('serving.html#inferenceserver.__init__', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer._handle': ('serving.html#inferenceserver._handle', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer._route': ('serving.html#inferenceserver._route', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.close': ('serving.html#inferenceserver.close', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.from_checkpoint': ( 'serving.html#inferenceserver.from_checkpoint',
+                                                                                    'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.run': ('serving.html#inferenceserver.run', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.serve_forever': ( 'serving.html#inferenceserver.serve_forever',
+                                                                                  'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.start': ('serving.html#inferenceserver.start', 'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.start_background': ( 'serving.html#inferenceserver.start_background',
+                                                                                     'miniai/serving.py'),
+                                'miniai.serving.InferenceServer.stop_background': ( 'serving.html#inferenceserver.stop_background',
+                                                                                    'miniai/serving.py'),
+                                'miniai.serving._sample_key': ('serving.html#_sample_key', 'miniai/serving.py'),
+                                'miniai.serving.decode_array': ('serving.html#decode_array', 'miniai/serving.py'),
+                                'miniai.serving.encode_array': ('serving.html#encode_array', 'miniai/serving.py'),
+                                'miniai.serving.http_response': ('serving.html#http_response', 'miniai/serving.py'),
+                                'miniai.serving.load_test': ('serving.html#load_test', 'miniai/serving.py'),
+                                'miniai.serving.read_message': ('serving.html#read_message', 'miniai/serving.py'),
+                                'miniai.serving.run_sync': ('serving.html#run_sync', 'miniai/serving.py')},
+            'miniai.shared_loader': { 'miniai.shared_loader.RingDataLoader': ( 'shared_loader.html#ringdataloader',
+                                                                               'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingDataLoader.__init__': ( 'shared_loader.html#ringdataloader.__init__',
+                                                                                        'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingDataLoader.__iter__': ( 'shared_loader.html#ringdataloader.__iter__',
+                                                                                        'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingDataLoader.__len__': ( 'shared_loader.html#ringdataloader.__len__',
+                                                                                       'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingWriter': ('shared_loader.html#ringwriter', 'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingWriter.__getitems__': ( 'shared_loader.html#ringwriter.__getitems__',
+                                                                                        'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingWriter.__init__': ( 'shared_loader.html#ringwriter.__init__',
+                                                                                    'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.RingWriter.__len__': ( 'shared_loader.html#ringwriter.__len__',
+                                                                                   'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.TaggedBatchSampler': ( 'shared_loader.html#taggedbatchsampler',
+                                                                                   'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.TaggedBatchSampler.__init__': ( 'shared_loader.html#taggedbatchsampler.__init__',
+                                                                                            'miniai/shared_loader.py'),
+                                      'miniai.shared_loader.TaggedBatchSampler.__iter__': ( 'shared_loader.html#taggedbatchsampler.__iter__',
+                                                                                            'miniai/shared_loader.py'),
+                                      'miniai.shared_loader._fields': ('shared_loader.html#_fields', 'miniai/shared_loader.py'),
+                                      'miniai.shared_loader._no_collate': ('shared_loader.html#_no_collate', 'miniai/shared_loader.py')},
+            'miniai.sweep': { 'miniai.sweep.MedianPruner': ('sweep.html#medianpruner', 'miniai/sweep.py'),
+                              'miniai.sweep.MedianPruner.__init__': ('sweep.html#medianpruner.__init__', 'miniai/sweep.py'),
+                              'miniai.sweep.MedianPruner.share': ('sweep.html#medianpruner.share', 'miniai/sweep.py'),
+                              'miniai.sweep.MedianPruner.should_prune': ('sweep.html#medianpruner.should_prune', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset': ('sweep.html#memmapdataset', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset.__getitem__': ('sweep.html#memmapdataset.__getitem__', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset.__getstate__': ('sweep.html#memmapdataset.__getstate__', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset.__init__': ('sweep.html#memmapdataset.__init__', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset.__len__': ('sweep.html#memmapdataset.__len__', 'miniai/sweep.py'),
+                              'miniai.sweep.MemmapDataset._open': ('sweep.html#memmapdataset._open', 'miniai/sweep.py'),
+                              'miniai.sweep.PruneCB': ('sweep.html#prunecb', 'miniai/sweep.py'),
+                              'miniai.sweep.PruneCB.__init__': ('sweep.html#prunecb.__init__', 'miniai/sweep.py'),
+                              'miniai.sweep.PruneCB.after_full_epoch': ('sweep.html#prunecb.after_full_epoch', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner': ('sweep.html#sweeprunner', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner.__init__': ('sweep.html#sweeprunner.__init__', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner._save': ('sweep.html#sweeprunner._save', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner._table': ('sweep.html#sweeprunner._table', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner.core_slots': ('sweep.html#sweeprunner.core_slots', 'miniai/sweep.py'),
+                              'miniai.sweep.SweepRunner.run': ('sweep.html#sweeprunner.run', 'miniai/sweep.py'),
+                              'miniai.sweep._init_worker': ('sweep.html#_init_worker', 'miniai/sweep.py'),
+                              'miniai.sweep._run_trial': ('sweep.html#_run_trial', 'miniai/sweep.py'),
+                              'miniai.sweep.grid': ('sweep.html#grid', 'miniai/sweep.py'),
+                              'miniai.sweep.save_memmap': ('sweep.html#save_memmap', 'miniai/sweep.py')},
+            'miniai.test': {'miniai.test.test': ('test.html#test', 'miniai/test.py')},
+            'miniai.tuner': { 'miniai.tuner.DataLoadersTuner': ('tuner.html#dataloaderstuner', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner.__init__': ('tuner.html#dataloaderstuner.__init__', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._best': ('tuner.html#dataloaderstuner._best', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._fmt': ('tuner.html#dataloaderstuner._fmt', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._load_cache': ('tuner.html#dataloaderstuner._load_cache', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._over_mem': ('tuner.html#dataloaderstuner._over_mem', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._refine': ('tuner.html#dataloaderstuner._refine', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._save_cache': ('tuner.html#dataloaderstuner._save_cache', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._search_bs': ('tuner.html#dataloaderstuner._search_bs', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner._search_workers': ( 'tuner.html#dataloaderstuner._search_workers',
+                                                                                 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner.dls': ('tuner.html#dataloaderstuner.dls', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner.probe': ('tuner.html#dataloaderstuner.probe', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner.results': ('tuner.html#dataloaderstuner.results', 'miniai/tuner.py'),
+                              'miniai.tuner.DataLoadersTuner.tune': ('tuner.html#dataloaderstuner.tune', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB': ('tuner.html#throughputcb', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB.__init__': ('tuner.html#throughputcb.__init__', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB._finish': ('tuner.html#throughputcb._finish', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB._sync': ('tuner.html#throughputcb._sync', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB.after_batch': ('tuner.html#throughputcb.after_batch', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB.after_epoch': ('tuner.html#throughputcb.after_epoch', 'miniai/tuner.py'),
+                              'miniai.tuner.ThroughputCB.before_fit': ('tuner.html#throughputcb.before_fit', 'miniai/tuner.py'),
+                              'miniai.tuner.host_key': ('tuner.html#host_key', 'miniai/tuner.py'),
+                              'miniai.tuner.n_cpus': ('tuner.html#n_cpus', 'miniai/tuner.py')},
+            'miniai.zero': { 'miniai.zero.ShardedOptimiser': ('zero.html#shardedoptimiser', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.__getattr__': ('zero.html#shardedoptimiser.__getattr__', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.__init__': ('zero.html#shardedoptimiser.__init__', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.gather_params': ('zero.html#shardedoptimiser.gather_params', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.load_state_dict': ( 'zero.html#shardedoptimiser.load_state_dict',
+                                                                               'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.lr': ('zero.html#shardedoptimiser.lr', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.state_dict': ('zero.html#shardedoptimiser.state_dict', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.step': ('zero.html#shardedoptimiser.step', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.sync_grads': ('zero.html#shardedoptimiser.sync_grads', 'miniai/zero.py'),
+                             'miniai.zero.ShardedOptimiser.zero_grad': ('zero.html#shardedoptimiser.zero_grad', 'miniai/zero.py'),
+                             'miniai.zero._dist_worker': ('zero.html#_dist_worker', 'miniai/zero.py'),
+                             'miniai.zero._free_port': ('zero.html#_free_port', 'miniai/zero.py'),
+                             'miniai.zero.opt_state_bytes': ('zero.html#opt_state_bytes', 'miniai/zero.py'),
+                             'miniai.zero.partition': ('zero.html#partition', 'miniai/zero.py'),
+                             'miniai.zero.run_distributed': ('zero.html#run_distributed', 'miniai/zero.py')}}}
@@ -41,6 +41,7 @@ def set_seed(seed, deterministic=False):
 
 # %% ../nbs/06_accel_sgd.ipynb 27
 class SGD:
+    state_keys = ()
     def __init__(self, params, lr, wd=0.):
         params = list(params)
         fc.store_attr()
@@ -52,13 +53,26 @@ class SGD:
                 self.opt_step(p)
     
     def reg_step(self, p): 
-        if self.wd !=0: p *= 1 - self.lr*self.wd
-    def opt_step(self, p): p -= p.grad * self.lr
+        if self.wd !=0: p *= 1 - self.lr_for(p)*self.wd
+    def opt_step(self, p): p -= p.grad * self.lr_for(p)
+    def lr_for(self, p):
+        # `lr` can be a tensor with one learning rate per model, for parameters stacked along their first dimension (see `EnsembleLearner`)
+        return self.lr.to(p.device).view(-1, *[1]*(p.ndim-1)) if torch.is_tensor(self.lr) else self.lr
+    def state_dict(self):
+        return {
+            'hypers': {k: v for k, v in vars(self).items() if k != 'params'},
+            'state': [{k: getattr(p, k) for k in self.state_keys if hasattr(p, k)} for p in self.params]
+        }
+    def load_state_dict(self, state):
+        vars(self).update(state['hypers'])
+        for p, s in zip(self.params, state['state']):
+            for k, v in s.items(): setattr(p, k, v.to(p.device))
     def zero_grad(self):
         for p in self.params: p.grad.data.zero_()
 
 # %% ../nbs/06_accel_sgd.ipynb 28
 class Adam(SGD):
+    state_keys = ('avg', 'sqr_avg', 'unbiased_sqr_avg')
     def __init__(self, params, lr, beta1=0.9, beta2=0.999, epsilon=1e-5, wd=0.):
         super().__init__(params, lr, wd)
         self.beta1, self.beta2, self.epsilon, self.i = beta1, beta2, epsilon, 0
@@ -71,8 +85,11 @@ class Adam(SGD):
         p.sqr_avg = (self.beta2 * p.sqr_avg) + ((1-self.beta2) * p.grad**2)
         unbiased_avg = p.avg / (1 - (self.beta1**(self.i+1)))
         p.unbiased_sqr_avg = p.sqr_avg / (1 - (self.beta2**(self.i+1)))
-        p -= (self.lr * unbiased_avg) / (p.unbiased_sqr_avg + self.epsilon).sqrt()
-        self.i += 1
+        p -= (self.lr_for(p) * unbiased_avg) / (p.unbiased_sqr_avg + self.epsilon).sqrt()
+        
+    def step(self):
+        super().step()
+        self.i += 1 # <----- once per step, not per parameter, so that the bias correction doesn't depend on the number of parameters
 
 # %% ../nbs/06_accel_sgd.ipynb 35
 class LRScheduler(Callback):
@@ -83,6 +100,12 @@ class LRScheduler(Callback):
     def before_fit(self): 
         self.schedo = self.sched(self.learn.opt)
         self.schedo.learn = self.learn
+    def state_dict(self):
+        state = self.schedo.state_dict() if hasattr(self.schedo, 'state_dict') else dict(vars(self.schedo))
+        return {k: v for k, v in state.items() if k not in ('optimizer', 'optimiser', 'learn')}
+    def load_state_dict(self, state):
+        if hasattr(self.schedo, 'load_state_dict'): self.schedo.load_state_dict(state)
+        else: vars(self.schedo).update(state)
     def after_batch(self): 
         if self.learn.model.training: self.schedo.step()
 
@@ -0,0 +1,87 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_checkpoint.ipynb.
+
+# %% auto 0
+__all__ = ['to_host', 'CheckpointCB', 'latest_checkpoint']
+
+# %% ../nbs/07_checkpoint.ipynb 2
+import os, copy, torch
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import fastcore.all as fc
+
+from .learner import *
+
+# %% ../nbs/07_checkpoint.ipynb 5
+def to_host(o):
+    """
+        Recursively copies a (nested) state dict, moving every tensor
+        to host memory, so that it is unaffected by further training.
+    """
+    if isinstance(o, torch.Tensor): return o.detach().to('cpu', copy=True)
+    if isinstance(o, dict): return {k: to_host(v) for k, v in o.items()}
+    if isinstance(o, list): return [to_host(v) for v in o]
+    if isinstance(o, tuple): return tuple(to_host(v) for v in o)
+    return copy.deepcopy(o)
+
+# %% ../nbs/07_checkpoint.ipynb 7
+class CheckpointCB(Callback):
+    """
+        Saves the state of the learner during training. The state is copied
+        to host memory on the training thread and written to disk on a
+        background thread, keeping only the most recent checkpoints.
+    """
+    order = ProgressCB.order + 3
+    def __init__(
+        self,
+        path='checkpoints', # Directory the checkpoints are written to
+        every=None, # Number of training batches between checkpoints. If None, checkpoints are only taken between epochs
+        keep=3, # Number of checkpoints kept on disk
+        fname='checkpoint' # Prefix of the checkpoint file names
+    ):
+        fc.store_attr()
+        self.path = Path(path)
+        
+    def before_fit(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.files = sorted(self.path.glob(f'{self.fname}_*.pth'))
+        self.writer, self.pending = ThreadPoolExecutor(max_workers=1), None
+        
+    def before_epoch(self):
+        # <----- not while resuming: the weights are not loaded yet, and would overwrite the checkpoint resumed from
+        if self.learn.model.training and self.learn.epoch > 0 and self.learn.resume_state is None: self.save()
+    
+    def after_batch(self):
+        if self.learn.model.training and self.every and (self.learn.iter+1) % self.every == 0: self.save(iter=self.learn.iter+1)
+        
+    def after_fit(self): self.save(epoch=self.learn.n_epochs)
+    
+    def cleanup_fit(self):
+        self.wait()
+        self.writer.shutdown()
+    
+    def save(self, epoch=None, iter=0):
+        self.wait()
+        state = to_host(self.learn.state_dict(epoch, iter))
+        fn = self.path/f"{self.fname}_{state['epoch']:03d}_{iter:06d}.pth"
+        self.pending = self.writer.submit(self._write, state, fn)
+        
+    def wait(self):
+        "Blocks until the checkpoint being written (if any) is on disk."
+        if self.pending is not None: self.pending.result()
+        self.pending = None
+        
+    def _write(self, state, fn):
+        tmp = fn.with_suffix('.tmp')
+        torch.save(state, tmp)
+        os.replace(tmp, fn)
+        if fn not in self.files: self.files.append(fn)
+        while len(self.files) > self.keep: self.files.pop(0).unlink(missing_ok=True)
+
+# %% ../nbs/07_checkpoint.ipynb 8
+def latest_checkpoint(
+    path='checkpoints', # Directory the checkpoints were written to
+    fname='checkpoint' # Prefix of the checkpoint file names
+):
+    "Returns the path of the most recent checkpoint, or None if there are none."
+    files = sorted(Path(path).glob(f'{fname}_*.pth'))
+    return files[-1] if files else None
@@ -4,7 +4,9 @@
 __all__ = ['ConvNormAct', 'ResnetStem', 'BottleneckBlock', 'ResnetStage', 'ResnetNN']
 
 # %% ../nbs/02_conv.ipynb 2
+import torch
 from torch import nn
+from torch.ao.nn.quantized import FloatFunctional
 from fastcore import docments
 
 # %% ../nbs/02_conv.ipynb 5
@@ -45,7 +47,8 @@ class ResnetStem(nn.Sequential):
     """
     def __init__(
         self,
-        stem_sizes: list # stem block channel sizes — [img_channels, 32, 32, 64] common
+        stem_sizes: list, # stem block channel sizes — [img_channels, 32, 32, 64] common
+        norm=nn.BatchNorm2d # type of normalisation passed down to each ConvNormAct layer
     ):
         super().__init__(
             *[
@@ -53,7 +56,8 @@ class ResnetStem(nn.Sequential):
                     in_channels=stem_sizes[i],
                     out_channels=stem_sizes[i+1],
                     kernel_size=3,
-                    stride=2 if i==0 else 1
+                    stride=2 if i==0 else 1,
+                    norm=norm
                 )
             for i in range(len(stem_sizes) - 1)
             ],
@@ -74,20 +78,21 @@ class BottleneckBlock(nn.Module):
         in_channels, # number of channels in the input
         out_channels, # number of channels in output after block
         reduction=4, # factor of reduction in the bottleneck
-        stride=1 # kernel stride (only affects the first ConvNormAct layer in the block)
+        stride=1, # kernel stride (only affects the first ConvNormAct layer in the block)
+        norm=nn.BatchNorm2d # type of normalisation passed down to each ConvNormAct layer
     ):
         super().__init__()
         reduced_features = out_channels // reduction
         
         self.block = nn.Sequential(
-            ConvNormAct(in_channels, reduced_features, kernel_size=1, stride=stride), # <----- including stride enables us to stride on this layer
-            ConvNormAct(reduced_features, reduced_features, kernel_size=3),
-            ConvNormAct(reduced_features, out_channels, kernel_size=1)
+            ConvNormAct(in_channels, reduced_features, kernel_size=1, stride=stride, norm=norm), # <----- including stride enables us to stride on this layer
+            ConvNormAct(reduced_features, reduced_features, kernel_size=3, stride=1, norm=norm),
+            ConvNormAct(reduced_features, out_channels, kernel_size=1, stride=1, norm=norm)
         )
         
         self.shortcut = (
             nn.Sequential(
-                ConvNormAct(in_channels, out_channels, kernel_size=1)
+                ConvNormAct(in_channels, out_channels, kernel_size=1, stride=1, norm=norm)
             ) if in_channels != out_channels else nn.Identity()
         )
         
@@ -95,12 +100,13 @@ class BottleneckBlock(nn.Module):
             nn.AvgPool2d(kernel_size=3, stride=stride, padding=1) 
             if stride != 1 else nn.Identity()
         )
+        self.skip_add = FloatFunctional() # <----- a plain add in float models, which quantisation replaces with an int8 add
         
     def forward(self, x):
         residual = x
         x = self.block(x)
         residual = self.shortcut(self.pool(residual))
-        x += residual
+        x = self.skip_add.add(x, residual) # <----- not in place, since the ReLU output is needed for the backward pass
         return x
 
 # %% ../nbs/02_conv.ipynb 9
@@ -116,12 +122,14 @@ class ResnetStage(nn.Sequential):
         in_channels, # Number of channels in the input
         out_channels, # Number of channels in the output
         depth, # Number of BottleneckBlocks included in the stage
-        stride=2 # Stride passed down to the BottleneckBlock (only affects the first ConvNormAct layer in child BottleneckBlock)
+        stride=2, # Stride passed down to the BottleneckBlock (only affects the first ConvNormAct layer in child BottleneckBlock)
+        norm=nn.BatchNorm2d, # type of normalisation passed down to each BottleneckBlock
+        reduction=4 # factor of reduction in the bottleneck of each BottleneckBlock
     ):
         super().__init__(
-            BottleneckBlock(in_channels, out_channels, stride=stride),
+            BottleneckBlock(in_channels, out_channels, reduction=reduction, stride=stride, norm=norm),
             *[
-                BottleneckBlock(out_channels, out_channels, stride=stride)
+                BottleneckBlock(out_channels, out_channels, reduction=reduction, stride=1, norm=norm)
                 for i in range(depth - 1)
             ]
         )
@@ -141,17 +149,19 @@ class ResnetNN(nn.Module):
         stem_sizes, # Number of channels to use in ConvNormAct layers in the ResnetStem block — [32,32,64] is a common choice
         widths, # Widths for the output of each layer. Wider layers usually means more capabilities, but more parameters and slower training
         depths, # Number of bottleneck blocks contained in each ResnetStage
-        num_classes # Number of possible labels in the training set
+        num_classes, # Number of possible labels in the training set
+        norm=nn.BatchNorm2d, # type of normalisation used throughout the network, e.g. `nn.BatchNorm2d` or the miniai `BatchNorm`
+        reduction=4 # factor of reduction in the bottleneck of each BottleneckBlock
     ):
         super().__init__()
         stem_sizes = [img_channels, *stem_sizes]
-        self.stem = ResnetStem(stem_sizes)
+        self.stem = ResnetStem(stem_sizes, norm=norm)
         
         self.stages = nn.ModuleList(
             [
-                ResnetStage(stem_sizes[-1], widths[0], depths[0], stride=1),
+                ResnetStage(stem_sizes[-1], widths[0], depths[0], stride=1, norm=norm, reduction=reduction),
                 *[
-                    ResnetStage(widths[i], widths[i+1], depths[i+1])
+                    ResnetStage(widths[i], widths[i+1], depths[i+1], norm=norm, reduction=reduction)
                     for i in range(len(widths) - 1)
                 ]
             ]
@@ -1,13 +1,15 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/00_core.ipynb.
 
 # %% auto 0
-__all__ = ['clean_ipython_hist', 'clean_tb', 'clean_gpu']
+__all__ = ['clean_ipython_hist', 'clean_tb', 'clean_gpu', 'host_rss', 'device_mem_stats', 'tensor_bytes']
 
 # %% ../nbs/00_core.ipynb 2
 import gc
+import os
 import torch
 import sys
 import traceback
+import types
 
 # %% ../nbs/00_core.ipynb 4
 def clean_ipython_hist():
@@ -38,3 +40,51 @@ def clean_gpu():
     clean_ipython_hist()
     gc.collect()
     torch.cuda.empty_cache()
+
+# %% ../nbs/00_core.ipynb 8
+def host_rss():
+    "Resident set size of this process in bytes (the peak RSS where `/proc` is not available)."
+    try:
+        with open('/proc/self/statm') as f: return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+# %% ../nbs/00_core.ipynb 9
+def device_mem_stats(device=None):
+    "Allocator stats of an accelerator in bytes, empty for the CPU, whose tensors are part of `host_rss`."
+    if device is None: device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    device = torch.device(device)
+    if device.type == 'cuda': 
+        return {'allocated': torch.cuda.memory_allocated(device), 'reserved': torch.cuda.memory_reserved(device), 
+                'peak': torch.cuda.max_memory_allocated(device)}
+    if device.type == 'mps': return {'allocated': torch.mps.current_allocated_memory(), 'reserved': torch.mps.driver_allocated_memory()}
+    return {}
+
+# %% ../nbs/00_core.ipynb 10
+def tensor_bytes(
+    obj, # Object to measure, e.g. a callback
+    skip=(torch.nn.Module, torch.optim.Optimizer), # Types that are not followed, as their tensors are expected to be alive
+    seen=None, # Set of ids already counted, shared between calls to count each tensor once
+    max_depth=6 # Maximum depth of containers and attributes followed
+):
+    """
+        Bytes of the tensor storages reachable from `obj` through lists,
+        tuples, sets, dicts and object attributes, counting each storage once.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen or max_depth < 0 or isinstance(obj, skip): return 0
+    seen.add(id(obj))
+    if torch.is_tensor(obj):
+        st = obj.untyped_storage()
+        key = ('storage', obj.device, st.data_ptr())
+        if key in seen: return 0
+        seen.add(key)
+        return st.nbytes()
+    if isinstance(obj, (str, bytes, int, float, bool, type, types.ModuleType, types.FunctionType, types.MethodType)) or obj is None: return 0
+    if isinstance(obj, dict): items = obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)): items = obj
+    elif hasattr(obj, '__dict__'): items = vars(obj).values()
+    else: return 0
+    return sum(tensor_bytes(o, skip, seen, max_depth-1) for o in items)
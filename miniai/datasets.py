@@ -1,9 +1,10 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/01_datasets.ipynb.
 
 # %% auto 0
-__all__ = ['inplace', 'collate_dict', 'DataLoaders']
+__all__ = ['inplace', 'collate_dict', 'DataLoaders', 'quadrants']
 
 # %% ../nbs/01_datasets.ipynb 2
+import torch
 from torch.utils.data import DataLoader, default_collate
 from operator import itemgetter
 from fastcore import docments
@@ -47,6 +48,32 @@ class DataLoaders:
         dd, # Dataset dict object (works with hugging face datasets) 
         batch_size: int, # Batch size for the dataloader
         as_tuple: bool=True, # If true, returns a tuple of dataloaders like (train, valid)
-        num_workers: int=4 # Number of CPUs used in parallel
+        num_workers: int=4, # Number of CPUs used in parallel
+        prefetch_factor: int=None, # Number of batches loaded in advance by each worker, ignored when `num_workers` is 0
+        **kwargs # Passed on to the Pytorch DataLoader
     ):
-        return cls(*[DataLoader(ds, batch_size, num_workers=num_workers, collate_fn=collate_dict(ds) if as_tuple else default_collate) for ds in dd.values()])
+        if num_workers == 0: prefetch_factor = None
+        return cls(*[DataLoader(ds, batch_size, num_workers=num_workers, prefetch_factor=prefetch_factor, collate_fn=collate_dict(ds) if as_tuple else default_collate, **kwargs) 
+                     for ds in dd.values()])
+
+# %% ../nbs/01_datasets.ipynb 12
+def quadrants(
+    n, # Number of samples
+    size=16, # Height and width of the images
+    shift=0.2, # Value added to the pixels of the patch
+    channels=1, # Number of channels
+    n_classes=4 # Number of classes. Classes past the last multiple of 4 put their patch in the centre
+):
+    """
+        Returns `n` noise images with a patch that gives away their class,
+        in quadrant `class % 4` and channel `class % channels`, and their
+        labels.
+    """
+    y = torch.randint(0, n_classes, (n,))
+    x = torch.randn(n, channels, size, size)
+    h = size // 2
+    corners = [(0, 0), (0, h), (h, 0), (h, h)]
+    for i in range(n_classes): 
+        r, c = corners[i % 4] if i < n_classes - n_classes % 4 else (h // 2, h // 2)
+        x[y==i, i % channels, r:r+h, c:c+h] += shift
+    return x, y
@@ -0,0 +1,183 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/23_distill.ipynb.
+
+# %% auto 0
+__all__ = ['random_crop_flip', 'DistillDataset', 'LogitStore', 'cache_teacher', 'soft_target_loss', 'DistillCB', 'DistillLearner']
+
+# %% ../nbs/23_distill.ipynb 2
+import json, torch, numpy as np
+import torch.nn.functional as F
+import fastcore.all as fc
+from pathlib import Path
+from torch import optim
+from torch.utils.data import Dataset, DataLoader
+
+from .learner import *
+
+# %% ../nbs/23_distill.ipynb 5
+def random_crop_flip(
+    pad=4, # Maximum shift in pixels, in each direction
+    flip=True # If true, images are also flipped horizontally half the time
+):
+    "Returns an augmentation `aug(x, gen)` that shifts an image tensor by up to `pad` pixels (zero padded), and optionally flips it."
+    def aug(x, gen):
+        h, w = x.shape[-2:]
+        i, j = torch.randint(0, 2*pad + 1, (2,), generator=gen).tolist()
+        x = F.pad(x, (pad, pad, pad, pad))[..., i:i+h, j:j+w]
+        if flip and torch.rand((), generator=gen) < 0.5: x = x.flip(-1)
+        return x
+    return aug
+
+class DistillDataset(Dataset):
+    """
+        Wraps a dataset of `(x, y)` samples into `(x, y, row)`, where `x` is
+        one of `n_views` deterministic augmented views of the sample and
+        `row` identifies the sample and view in a `LogitStore`.
+    """
+    def __init__(
+        self,
+        ds, # Dataset of `(x, y, ...)` tuples
+        aug=None, # Augmentation `aug(x, gen)`, or None
+        n_views=1, # Number of augmented views of each sample
+        seed=0, # Seed of the augmentations
+        all_views=False # If true, the dataset has one item per view of each sample (as used to cache the teacher), otherwise one per sample with a random view
+    ): self.ds, self.aug, self.n_views, self.seed, self.all_views = ds, aug, n_views, seed, all_views
+        
+    def __len__(self): return len(self.ds) * (self.n_views if self.all_views else 1)
+    
+    def view(self, i, v):
+        "View `v` of sample `i`, always the same."
+        x, y = self.ds[i][:2]
+        if self.aug is not None: x = self.aug(x, torch.Generator().manual_seed(self.seed * 1_000_003 + i * self.n_views + v))
+        return x, y
+    
+    def __getitem__(self, i):
+        if self.all_views: i, v = divmod(i, self.n_views)
+        else: v = int(torch.randint(self.n_views, ())) if self.n_views > 1 else 0
+        return *self.view(i, v), i * self.n_views + v
+
+# %% ../nbs/23_distill.ipynb 7
+class LogitStore:
+    "Memory-mapped store of teacher logits, as fp16, optionally only the top-k classes, one row per sample and view."
+    def __init__(self, path): self.path, self.logits = Path(path), None
+    
+    @classmethod
+    def create(cls, path, n_rows, n_classes, k=None, n_views=1, seed=0):
+        "Creates an empty store for `n_rows` rows of `n_classes` logits."
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path/'meta.json').write_text(json.dumps(dict(n_rows=n_rows, n_classes=n_classes, k=k, n_views=n_views, seed=seed)))
+        np.lib.format.open_memmap(path/'logits.npy', 'w+', np.float16, (n_rows, k or n_classes))
+        if k: np.lib.format.open_memmap(path/'classes.npy', 'w+', np.int16 if n_classes < 2**15 else np.int32, (n_rows, k))
+        return cls(path)
+    
+    def _open(self, mode='r'):
+        self.meta = json.loads((self.path/'meta.json').read_text())
+        self.logits = np.load(self.path/'logits.npy', mmap_mode=mode)
+        self.classes = np.load(self.path/'classes.npy', mmap_mode=mode) if self.meta['k'] else None
+        
+    def __len__(self):
+        if self.logits is None: self._open()
+        return len(self.logits)
+        
+    def write(self, rows, logits):
+        "Stores the (top-k) `logits` of a batch at `rows`."
+        if self.logits is None or self.logits.mode != 'r+': self._open('r+')
+        rows = np.asarray(rows)
+        if self.classes is not None: 
+            logits, classes = logits.topk(self.meta['k'], dim=1)
+            self.classes[rows] = classes.numpy()
+        self.logits[rows] = logits.half().numpy()
+        
+    def flush(self):
+        self.logits.flush()
+        if self.classes is not None: self.classes.flush()
+        self.logits = None # <----- reopened read-only on the next read
+        
+    def read(self, rows):
+        "Returns the logits stored at `rows`, as float32, and the indices of their classes (or None if all classes are stored)."
+        if self.logits is None: self._open()
+        rows = np.asarray(rows)
+        return torch.from_numpy(self.logits[rows].astype(np.float32)), None if self.classes is None else torch.from_numpy(self.classes[rows].astype(np.int64))
+    
+    def dataset(self, ds, aug=None):
+        "The `DistillDataset` of `ds` with the views the teacher was cached on."
+        if self.logits is None: self._open()
+        return DistillDataset(ds, aug, self.meta['n_views'], self.meta['seed'])
+    
+    def __getstate__(self): return {**self.__dict__, 'logits': None, 'classes': None}
+
+# %% ../nbs/23_distill.ipynb 8
+@torch.inference_mode()
+def cache_teacher(
+    teacher, # Trained teacher model
+    ds, # Training dataset of `(x, y)` samples
+    path, # Directory of the store
+    aug=None, # Augmentation `aug(x, gen)` used to train the student, or None
+    n_views=1, # Number of augmented views of each sample
+    seed=0, # Seed of the augmentations
+    k=None, # If set, only the top `k` logits of each row are stored
+    bs=256, # Batch size of the teacher
+    device=None, # Device of the teacher, defaults to `get_device()`
+    num_workers=0 # Number of workers of the DataLoader
+):
+    "Runs `teacher` once over all the views of `ds`, and stores its logits in a `LogitStore`."
+    device = device or get_device()
+    teacher.eval().to(device)
+    src = DistillDataset(ds, aug, n_views, seed, all_views=True)
+    store = None
+    for xb, _, rows in DataLoader(src, bs, num_workers=num_workers):
+        out = teacher(xb.to(device)).float().cpu()
+        if store is None: store = LogitStore.create(path, len(src), out.shape[1], k, n_views, seed)
+        store.write(rows, out)
+    store.flush()
+    return store
+
+# %% ../nbs/23_distill.ipynb 10
+def soft_target_loss(
+    preds, # Logits of the student
+    logits, # Logits of the teacher, for all classes or only `classes`
+    classes=None, # Indices of the classes of `logits`, or None if they cover all classes
+    T=2. # Temperature
+):
+    "Cross-entropy between the softened teacher and student distributions, scaled by `T²`."
+    logp = F.log_softmax(preds / T, dim=1)
+    if classes is not None: logp = logp.gather(1, classes)
+    return -(F.softmax(logits / T, dim=1) * logp).sum(1).mean() * T * T
+
+class DistillCB(Callback):
+    "Takes the store rows out of the batch and reads the soft targets of training batches (with no store, only drops the rows)."
+    order = DeviceCB.order - 1 # <----- before `DeviceCB`, which expects `(xb, yb)` batches
+    in_lr_find = True
+    def __init__(self, store=None): self.store = store
+    def before_batch(self):
+        self.learn.soft = None
+        if len(self.learn.batch) != 3: return
+        xb, yb, rows = self.learn.batch
+        self.learn.batch = (xb, yb)
+        if self.learn.model.training and self.store is not None: self.learn.soft = self.store.read(rows.cpu())
+
+class DistillLearner(BaseLearner):
+    """
+        Learner that trains a student on a mix of the labels and the soft
+        targets cached in a `LogitStore`.
+    """
+    def __init__(
+        self,
+        dls, # DataLoaders whose training set is a `DistillDataset` (e.g. from `LogitStore.dataset`)
+        model, # Student model
+        store, # `LogitStore` of the teacher logits
+        alpha=0.5, # Weight of the soft loss
+        T=2., # Temperature
+        opt_func=optim.SGD, # Optimisation function
+        loss_func=F.cross_entropy, # Loss on the labels
+        cbs=None, # Other callbacks
+        **kwargs # Passed on to `Learner`
+    ):
+        self.store, self.alpha, self.T = store, alpha, T
+        super().__init__(dls, model, opt_func=opt_func, loss_func=loss_func, cbs=(cbs or []) + [DistillCB(store)], **kwargs)
+        
+    def get_loss(self):
+        super().get_loss()
+        if getattr(self, 'soft', None) is None: return
+        logits, classes = (None if t is None else t.to(self.preds.device) for t in self.soft)
+        self.loss = (1 - self.alpha) * self.loss + self.alpha * soft_target_loss(self.preds, logits, classes, self.T)
@@ -0,0 +1,111 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_early_stopping.ipynb.
+
+# %% auto 0
+__all__ = ['StopWhen', 'EarlyStoppingCB']
+
+# %% ../nbs/08_early_stopping.ipynb 2
+import math, time, torch
+from itertools import takewhile
+from torch.utils.data import DataLoader, Subset
+import fastcore.all as fc
+
+from .learner import *
+
+# %% ../nbs/08_early_stopping.ipynb 5
+class StopWhen:
+    """
+        Wraps a dataloader so that iteration ends as soon as `stop()`
+        returns True, while keeping the length of the loader.
+    """
+    def __init__(self, dl, stop): self.dl, self.stop = dl, stop
+    def __len__(self): return len(self.dl)
+    def __iter__(self): return takewhile(lambda _: not self.stop(), self.dl)
+
+# %% ../nbs/08_early_stopping.ipynb 7
+class EarlyStoppingCB(Callback):
+    """
+        Stops training when the monitored validation metric stops improving,
+        when a wall-clock or step budget runs out, or when the training loss
+        diverges. Intermediate validations can run every few epochs on a fixed
+        random subset of the validation set.
+    """
+    def __init__(
+        self,
+        monitor='Valid loss', # Column of the `MetricsCB` log that is monitored for a plateau
+        mode=None, # 'min' or 'max'. If None, 'min' is used when monitoring a loss and 'max' otherwise
+        patience=3, # Number of validations without improvement before stopping. If None, plateaus are ignored
+        min_delta=0., # Minimum change in the monitored metric that counts as an improvement
+        max_time=None, # Wall-clock budget for the whole fit, in seconds
+        max_steps=None, # Budget of training steps for the whole fit
+        div_factor=4., # Stops when the smoothed training loss exceeds its minimum by this factor
+        check_every=10, # Number of steps between divergence checks (each check syncs with the device)
+        valid_every=1, # Number of epochs between validations. The last epoch is always validated
+        valid_subset=None, # Fraction (float) or number (int) of validation samples used for intermediate validations
+        seed=42 # Seed for the choice of the validation subset
+    ):
+        fc.store_attr()
+        if mode is None: self.mode = 'min' if 'loss' in monitor.lower() else 'max'
+        
+    def before_fit(self):
+        self.metrics = next((cb for cb in self.learn.cbs if isinstance(cb, MetricsCB)), None)
+        if self.patience is not None:
+            if self.metrics is None: raise ValueError(f"EarlyStoppingCB monitors {self.monitor!r}, but the learner has no MetricsCB (use patience=None to only check budgets and divergence)")
+            if self.monitor not in self.metrics.columns: raise ValueError(f"EarlyStoppingCB monitors {self.monitor!r}, which isn't one of the MetricsCB columns {self.metrics.columns}")
+        self.start, self.steps, self.reason = time.monotonic(), 0, None
+        self.best, self.n_bad, self.smooth, self.min_smooth, self.diverged = None, 0, None, None, None
+        self.subset = self._subset(self.learn.dls.valid) if self.valid_subset else None
+        
+    def _subset(self, dl):
+        n = len(dl.dataset)
+        size = int(n*self.valid_subset) if isinstance(self.valid_subset, float) else min(self.valid_subset, n)
+        idx = torch.randperm(n, generator=torch.Generator().manual_seed(self.seed))[:size]
+        return DataLoader(Subset(dl.dataset, idx.tolist()), dl.batch_size, collate_fn=dl.collate_fn, num_workers=dl.num_workers)
+        
+    def before_epoch(self):
+        if self.learn.model.training: self.learn.dl = StopWhen(self.learn.dl, lambda: self.reason is not None)
+        elif self.reason is None and self.learn.epoch < self.learn.n_epochs - 1:
+            if (self.learn.epoch + 1) % self.valid_every: self.learn.dl = []
+            elif self.subset is not None: self.learn.dl = self.subset
+    
+    def after_batch(self):
+        if not self.learn.model.training: return
+        self.steps += 1
+        self._track(self.learn.loss.detach())
+        if self.steps % self.check_every == 0 and self.diverged.item(): 
+            self.reason = 'loss diverged'
+            print(f'Stopping early: {self.reason}')
+            raise CancelFitException()
+        if self.max_steps is not None and self.steps >= self.max_steps: self.reason = 'step budget reached'
+        if self.max_time is not None and time.monotonic() - self.start >= self.max_time: self.reason = 'time budget reached'
+        
+    def _track(self, loss):
+        if self.smooth is None: 
+            self.smooth, self.min_smooth, self.diverged = loss.clone(), loss.clone(), ~torch.isfinite(loss)
+            return
+        self.smooth.lerp_(loss, 0.1)
+        torch.minimum(self.min_smooth, self.smooth, out=self.min_smooth)
+        self.diverged |= ~torch.isfinite(loss) | (self.smooth > self.div_factor*self.min_smooth)
+        
+    def after_full_epoch(self):
+        if self.reason is None and self.patience is not None: self._check_plateau()
+        if self.reason is not None: 
+            print(f'Stopping early: {self.reason}')
+            raise CancelFitException()
+            
+    def _check_plateau(self):
+        value = float(self.metrics.log[self.monitor].iloc[0])
+        if math.isnan(value): return
+        if self.best is None or (value < self.best - self.min_delta if self.mode == 'min' else value > self.best + self.min_delta): 
+            self.best, self.n_bad = value, 0
+        else:
+            self.n_bad += 1
+            if self.n_bad >= self.patience: self.reason = f'{self.monitor} has not improved for {self.n_bad} validations'
+            
+    def state_dict(self):
+        return {'elapsed': time.monotonic() - self.start, 'steps': self.steps, 'best': self.best, 'n_bad': self.n_bad,
+                'smooth': self.smooth, 'min_smooth': self.min_smooth, 'diverged': self.diverged}
+    
+    def load_state_dict(self, state):
+        self.start = time.monotonic() - state['elapsed'] # <----- the time budget covers the time spent before the interruption
+        self.steps, self.best, self.n_bad = state['steps'], state['best'], state['n_bad']
+        self.smooth, self.min_smooth, self.diverged = state['smooth'], state['min_smooth'], state['diverged']
@@ -0,0 +1,85 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/17_ema.ipynb.
+
+# %% auto 0
+__all__ = ['EMACB']
+
+# %% ../nbs/17_ema.ipynb 2
+import copy, torch
+import fastcore.all as fc
+
+from .learner import *
+
+# %% ../nbs/17_ema.ipynb 5
+class EMACB(Callback):
+    """
+        Keeps an exponential moving average of the parameters and floating
+        point buffers of the model, updated every few steps with foreach
+        operations, and optionally validates on the averaged weights.
+    """
+    order = 1 # <----- after `DeviceCB`, so that the shadow weights are created on the device of the model
+    def __init__(
+        self,
+        decay=0.999, # Decay of the average, per step
+        every=1, # Number of training steps between updates
+        warmup=True, # If true, the decay ramps up from 0.1 to `decay` over the first updates
+        device=None, # Device of the shadow weights, defaults to that of the model (e.g. 'cpu' to save accelerator memory)
+        validate=True # If true, validation runs on the EMA weights
+    ): 
+        fc.store_attr()
+        self.shadow = None
+        
+    def before_fit(self):
+        model = self.learn.model
+        self.tensors = [p for p in model.parameters()] + [b for b in model.buffers() if b.is_floating_point()]
+        if self.shadow is None: 
+            self.shadow = [t.detach().clone().to(self.device or t.device) for t in self.tensors]
+            self.n, self.steps = 0, 0
+        self.swapped, self.same_device = False, all(s.device == t.device for s, t in zip(self.shadow, self.tensors))
+            
+    def decay_at(self, n): return min(self.decay, (1 + n) / (10 + n)) if self.warmup else self.decay
+            
+    @torch.no_grad()
+    def update(self):
+        "Moves the shadow weights towards the current weights."
+        w = 1 - self.decay_at(self.n) ** self.every
+        cur = [t.detach() for t in self.tensors]
+        if not self.same_device: cur = [t.to(s.device) for t, s in zip(cur, self.shadow)]
+        torch._foreach_lerp_(self.shadow, cur, w)
+        self.n += 1
+        
+    def after_batch(self):
+        if not self.learn.model.training: return
+        self.steps += 1
+        if self.steps % self.every == 0: self.update()
+            
+    @torch.no_grad()
+    def swap(self):
+        "Swaps the weights of the model with the EMA weights (calling it again swaps them back)."
+        if self.same_device:
+            for t, s in zip(self.tensors, self.shadow): t.data, s.data = s.data, t.data
+        elif not self.swapped:
+            self.backup = [t.detach().clone() for t in self.tensors]
+            for t, s in zip(self.tensors, self.shadow): t.copy_(s)
+        else:
+            for t, b in zip(self.tensors, self.backup): t.copy_(b)
+            self.backup = None
+        self.swapped = not self.swapped
+            
+    def before_epoch(self):
+        if self.validate and not self.learn.model.training: self.swap()
+            
+    def cleanup_epoch(self):
+        if self.swapped: self.swap()
+            
+    def ema_model(self):
+        "Returns a copy of the model with the EMA weights."
+        model = copy.deepcopy(self.learn.model)
+        tensors = [p for p in model.parameters()] + [b for b in model.buffers() if b.is_floating_point()]
+        with torch.no_grad(): 
+            for t, s in zip(tensors, self.shadow): t.copy_(s)
+        return model
+    
+    def state_dict(self): return {'shadow': [s.clone() for s in self.shadow], 'n': self.n, 'steps': self.steps}
+    def load_state_dict(self, state):
+        with torch.no_grad(): torch._foreach_copy_(self.shadow, [s.to(t.device) for s, t in zip(state['shadow'], self.shadow)])
+        self.n, self.steps = state['n'], state['steps']
@@ -0,0 +1,126 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/13_ensemble.ipynb.
+
+# %% auto 0
+__all__ = ['Ensemble', 'EnsembleLearner', 'EnsembleMetricsCB']
+
+# %% ../nbs/13_ensemble.ipynb 2
+import copy, math, torch
+import pandas as pd
+import torch.nn.functional as F
+from torch import nn, tensor
+from torch.func import stack_module_state, functional_call, vmap
+
+from .learner import *
+from .accel import SGD
+
+# %% ../nbs/13_ensemble.ipynb 5
+class Ensemble(nn.Module):
+    """
+        Runs K models with identical architectures as a single module, by
+        vmapping over their stacked parameters and buffers. Returns the
+        predictions of every model, stacked along the first dimension.
+    """
+    def __init__(
+        self, 
+        models # Models with identical architectures, e.g. with different seeds
+    ):
+        super().__init__()
+        params, buffers = stack_module_state(models)
+        self.n_models, self.names = len(models), {n: n.replace('.', '-') for n in [*params, *buffers]}
+        for n, p in params.items(): self.register_parameter(self.names[n], nn.Parameter(p))
+        for n, b in buffers.items(): self.register_buffer(self.names[n], b)
+        object.__setattr__(self, 'base', copy.deepcopy(models[0]).to('meta')) # <----- not registered, so its meta tensors stay out of `parameters()`
+        self.base.train(self.training)
+        
+    def train(self, mode=True):
+        self.base.train(mode)
+        return super().train(mode)
+    
+    def _call(self, params, buffers, x): return functional_call(self.base, (params, buffers), (x,))
+        
+    def forward(self, x):
+        params = {n: getattr(self, k) for n, k in self.names.items() if k in self._parameters}
+        buffers = {n: getattr(self, k) for n, k in self.names.items() if k in self._buffers}
+        return vmap(self._call, in_dims=(0, 0, None), randomness='different')(params, buffers, x)
+    
+    def models(self):
+        "Returns the K models as separate modules, with copies of their weights."
+        state = {n: getattr(self, k) for n, k in self.names.items()}
+        res = []
+        for i in range(self.n_models):
+            m = copy.deepcopy(self.base).to_empty(device=next(iter(state.values())).device)
+            m.load_state_dict({n: t[i] for n, t in state.items()})
+            res.append(m)
+        return res
+
+# %% ../nbs/13_ensemble.ipynb 7
+class EnsembleLearner(BaseLearner):
+    """
+        Trains K models with identical architectures in lockstep on the same
+        batches, as a single vmapped `Ensemble`, keeping one loss per model.
+    """
+    def __init__(
+        self,
+        dls, # Dataloaders object, expected as a tuple of (train, valid)
+        models, # Models with identical architectures
+        opt_func=SGD, # Optimiser. Per-model learning rates need the miniai `SGD` or `Adam`
+        loss_func=F.cross_entropy, # Loss function of a single model, which must return the mean loss of the batch
+        cbs=None # Optional list of callbacks
+    ):
+        super().__init__(dls, Ensemble(models), opt_func=opt_func, loss_func=loss_func, cbs=cbs)
+        
+    def fit(self, lr, epochs, **kwargs):
+        "`lr` is a learning rate shared by every model, or a sequence of one learning rate per model."
+        if not isinstance(lr, (int, float)): lr = tensor(lr, dtype=torch.float32)
+        super().fit(lr, epochs, **kwargs)
+        
+    def get_loss(self):
+        self.losses = vmap(self.loss_func, in_dims=(0, None))(self.preds, self.yb)
+        self.loss = self.losses.sum()
+
+# %% ../nbs/13_ensemble.ipynb 8
+class EnsembleMetricsCB(MetricsCB):
+    """
+        Computes the losses and metrics of each model of an `EnsembleLearner`,
+        and of the ensemble (mean of the softmax probabilities), and logs
+        them as one row per model.
+    """
+    def __init__(self, n_models, *ms, **metrics):
+        super().__init__(*ms, **metrics)
+        self.n_models = n_models
+        self.model_metrics = [copy.deepcopy(self.all_metrics) for _ in range(n_models + 1)]
+        
+    @property
+    def columns(self): return ['Train loss', 'Valid loss', *[k.title() for k in self.metrics if k != 'loss']]
+        
+    def before_full_epoch(self):
+        self.log = pd.DataFrame(math.nan, index=[*range(self.n_models), 'ensemble'], columns=self.columns)
+        
+    def before_epoch(self): [o.reset() for ms in self.model_metrics for o in ms.values()]
+    
+    def after_batch(self):
+        x, y = to_cpu(self.learn.batch)
+        preds, losses = to_cpu(self.learn.preds), to_cpu(self.learn.losses)
+        log_probs = preds.float().log_softmax(-1).logsumexp(0) - math.log(self.n_models) # <----- log of the mean of the probabilities
+        for ms, p, l in zip(self.model_metrics, [*preds, log_probs], [*losses, F.nll_loss(log_probs, y)]):
+            for k, o in ms.items(): 
+                if k == 'loss': o.update(l, weight=len(x))
+                else: o.update(p, y)
+                    
+    def after_epoch(self):
+        if not self.model_metrics[0]['loss'].weights: return
+        stage = 'Train' if self.learn.model.training else 'Valid'
+        for i, ms in zip(self.log.index, self.model_metrics):
+            self.log.loc[i, f'{stage} loss'] = round(float(ms['loss'].compute()), 4)
+            if stage == 'Valid':
+                for k, o in ms.items(): 
+                    if k != 'loss': self.log.loc[i, k.title()] = round(float(o.compute()), 4)
+                        
+    def state_dict(self): 
+        return {'epoch': self.learn.epoch, 'log': self.log, 'metrics': [{k: o.state_dict() for k, o in ms.items()} for ms in self.model_metrics]}
+    
+    def load_state_dict(self, state):
+        if state['epoch'] != self.learn.epoch: return
+        self.log = state['log']
+        for ms, s in zip(self.model_metrics, state['metrics']):
+            for k, o in ms.items(): o.load_state_dict(s[k])
@@ -0,0 +1,97 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/19_grad_monitor.ipynb.
+
+# %% auto 0
+__all__ = ['GradMonitorCB']
+
+# %% ../nbs/19_grad_monitor.ipynb 2
+import torch, pandas as pd, matplotlib.pyplot as plt
+import fastcore.all as fc
+
+from .learner import *
+
+# %% ../nbs/19_grad_monitor.ipynb 5
+class GradMonitorCB(Callback):
+    """
+        Records per-parameter gradient norms with a single foreach call per
+        step, in a ring buffer on the device that is flushed to the CPU every
+        few steps, plus update-to-weight ratios. Optionally clips gradients
+        and zeroes the gradients of steps with non-finite ones.
+    """
+    order = 1 # <----- after `DeviceCB`, so that the buffer is created on the device of the model
+    def __init__(
+        self,
+        every=50, # Number of steps between copies of the buffer to the CPU
+        max_norm=None, # If set, gradients are clipped to this total norm
+        skip_nonfinite=True, # If true, NaN or infinite gradients are zeroed before the step, without syncing with the device
+        ratio_every=None, # Number of steps between update-to-weight ratio measurements, defaults to `every` (0 turns them off)
+        on_flush=None # Optional function called with the callback after each flush, e.g. to send the stats to a logger
+    ):
+        fc.store_attr()
+        if ratio_every is None: self.ratio_every = every
+        
+    def before_fit(self):
+        self.names, self.params = map(list, zip(*[(n, p) for n, p in self.learn.model.named_parameters() if p.requires_grad]))
+        self.buf = torch.zeros(self.every, len(self.params), device=self.params[0].device)
+        self.n, self.steps, self.prev, self.pending = 0, 0, None, []
+        self.history, self.ratios, self.nonfinite, self.skipped = [], [], [], []
+        
+    def after_backward(self):
+        grads = [p.grad if p.grad is not None else p.new_zeros(()) for p in self.params]
+        norms = torch.stack(torch._foreach_norm(grads))
+        self.buf[self.n] = norms
+        total = norms.norm()
+        if self.skip_nonfinite: # <----- decided on the device: reading `total` back would sync every step
+            bad = ~total.isfinite()
+            for g in grads: g.masked_fill_(bad, 0.)
+        if self.max_norm is not None: torch._foreach_mul_(grads, (self.max_norm / (total + 1e-6)).clamp(max=1.).nan_to_num(0.))
+        if self.ratio_every and (self.steps + 1) % self.ratio_every == 0: self.prev = [p.detach().clone() for p in self.params]
+            
+    @torch.no_grad()
+    def _ratios(self):
+        w = [p.detach() for p in self.params]
+        upd = torch.stack(torch._foreach_norm(torch._foreach_sub(w, self.prev)))
+        self.pending.append((self.steps, upd / torch.stack(torch._foreach_norm(w))))
+        self.prev = None
+        
+    def cleanup_batch(self):
+        if not self.learn.model.training: return
+        if self.prev is not None: self._ratios()
+        self.prev = None
+        self.steps, self.n = self.steps + 1, self.n + 1
+        if self.n == self.every: self.flush()
+            
+    def flush(self):
+        "Copies the buffered stats to the CPU history."
+        if self.n == 0: return
+        norms = self.buf[:self.n].to('cpu', copy=True) # <----- `.cpu()` would return a view of the buffer on the CPU
+        start = self.steps - self.n
+        nonfinite = [start + i for i in (~norms.norm(dim=1).isfinite()).nonzero().flatten().tolist()]
+        self.nonfinite += nonfinite
+        if self.skip_nonfinite: self.skipped += nonfinite
+        self.history.append(norms)
+        self.ratios += [(s, r.cpu()) for s, r in self.pending] # <----- new tensors, not views of the buffer
+        self.n, self.pending = 0, []
+        if self.on_flush is not None: self.on_flush(self)
+            
+    def cleanup_fit(self): self.flush()
+        
+    @property
+    def grad_norms(self): 
+        "Tensor of per-parameter gradient norms, one row per step."
+        return torch.cat(self.history) if self.history else torch.zeros(0, len(self.params))
+    
+    def summary(self):
+        "DataFrame with the last and mean gradient norm and the last update-to-weight ratio of each parameter."
+        norms = self.grad_norms
+        df = pd.DataFrame({'Grad norm': norms[-1], 'Mean grad norm': norms.nanmean(0)}, index=self.names)
+        if self.ratios: df['Update/weight'] = self.ratios[-1][1]
+        return df
+    
+    def plot(self, figsize=(10, 4)):
+        "Plots the total gradient norm per step, and the update-to-weight ratios of each parameter."
+        fig, axs = plt.subplots(1, 2, figsize=figsize)
+        axs[0].plot(self.grad_norms.norm(dim=1))
+        axs[0].set_yscale('log'); axs[0].set_title('Total grad norm')
+        if self.ratios:
+            axs[1].plot([s for s, _ in self.ratios], torch.stack([r for _, r in self.ratios]))
+            axs[1].set_yscale('log'); axs[1].set_title('Update/weight')
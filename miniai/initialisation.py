@@ -76,12 +76,13 @@ def normalise_batch(b):
 
 # %% ../nbs/05_initialisation.ipynb 32
 class BatchTransform(Callback):
+    in_lr_find = True
     def __init__(self, func, on_train=True, on_val=False): fc.store_attr()
     def before_batch(self): 
         if (self.on_train and self.learn.model.training) or (self.on_val and not self.learn.model.training):
             self.learn.batch = self.func(self.learn.batch)
 
-# %% ../nbs/05_initialisation.ipynb 37
+# %% ../nbs/05_initialisation.ipynb 38
 class LayerNorm(nn.Module):
     def __init__(self, dummy, epsilon=1e-5):
         super().__init__()
@@ -89,37 +90,46 @@ class LayerNorm(nn.Module):
         self.add = nn.Parameter(tensor(0.))
         self.mult = nn.Parameter(tensor(1.))
     def forward(self, x):
-        mean = x.mean((1, 2, 3), keepdim=True)
-        var = x.var((1, 2, 3), keepdim=True)
-        norm = (x-mean)/(var+self.epsilon).sqrt()
-        return norm*self.mult + self.add
+        var, mean = torch.var_mean(x, (1, 2, 3), unbiased=False, keepdim=True)
+        scale = self.mult * (var + self.epsilon).rsqrt()
+        return torch.addcmul(self.add - mean*scale, x, scale)
 
-# %% ../nbs/05_initialisation.ipynb 40
+# %% ../nbs/05_initialisation.ipynb 42
 class BatchNorm(nn.Module):
-    def __init__(self, out_channels, mom=0.9, epsilon=1e-5):
+    def __init__(self, out_channels, mom=0.9, epsilon=1e-5, inplace=False):
         super().__init__()
-        self.epsilon, self.mom = epsilon, mom
+        self.epsilon, self.mom, self.inplace = epsilon, mom, inplace
         self.adds = nn.Parameter(torch.zeros(out_channels, 1, 1))
         self.mults = nn.Parameter(torch.ones(out_channels, 1, 1))
         self.register_buffer('means', torch.zeros(1, out_channels, 1, 1))
         self.register_buffer('vars', torch.ones(1, out_channels, 1, 1))
+        self._cache = None
     
     def update(self, x):
-        mean = x.mean((0, 2, 3), keepdim=True)
-        var = x.var((0, 2, 3), keepdim=True)
-        self.means.lerp_(mean, self.mom)
-        self.vars.lerp_(var, self.mom)
+        var, mean = torch.var_mean(x, (0, 2, 3), unbiased=False, keepdim=True)
+        with torch.no_grad():
+            n = x.numel() // x.shape[1]
+            self.means.lerp_(mean, self.mom)
+            self.vars.lerp_(var * n / max(n - 1, 1), self.mom)
         return mean, var
     
+    def scale_shift(self, mean, var):
+        scale = self.mults * (var + self.epsilon).rsqrt()
+        return scale, self.adds - mean*scale
+    
+    def cached_scale_shift(self):
+        key = tuple((t.data_ptr(), t._version) for t in (self.mults, self.adds, self.means, self.vars))
+        if self._cache is None or self._cache[0] != key: self._cache = key, self.scale_shift(self.means, self.vars)
+        return self._cache[1]
+    
     def forward(self, x):
-        if self.training:
-            with torch.no_grad():
-                mean, var = self.update(x)
-        else: mean, var = self.means, self.vars
-        norm = (x-mean)/(var-self.epsilon).sqrt()
-        return norm*self.mults + self.adds
-
-# %% ../nbs/05_initialisation.ipynb 45
+        if self.training: scale, shift = self.scale_shift(*self.update(x))
+        elif torch.is_grad_enabled(): scale, shift = self.scale_shift(self.means, self.vars)
+        else: scale, shift = self.cached_scale_shift()
+        if self.inplace and not torch.is_grad_enabled(): return x.mul_(scale).add_(shift)
+        return torch.addcmul(shift, x, scale)
+
+# %% ../nbs/05_initialisation.ipynb 53
 class GeneralReLU(nn.Module):
     def __init__(self, subtract=None, leak=None, maxv=None):
         super().__init__()
@@ -130,6 +140,6 @@ class GeneralReLU(nn.Module):
         if self.maxv is not None: x.clamp_max_(self.maxv)
         return x
 
-# %% ../nbs/05_initialisation.ipynb 47
+# %% ../nbs/05_initialisation.ipynb 55
 def kaiming_init(layer, leak=None):
     if isinstance(layer, (nn.Conv1d, nn.Conv2d, nn.Conv3d, nn.Linear)): nn.init.kaiming_normal_(layer.weight, a=leak)
@@ -0,0 +1,152 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/22_latency.ipynb.
+
+# %% auto 0
+__all__ = ['model_units', 'LatencyTable', 'fine_rank']
+
+# %% ../nbs/22_latency.ipynb 2
+import json, os, time, torch, numpy as np, pandas as pd
+from pathlib import Path
+import fastcore.all as fc
+from torch import nn
+from torcheval.metrics import MulticlassAccuracy
+
+from .conv import *
+from .learner import *
+from .profiler import count_macs
+from .tuner import host_key
+from .sweep import grid
+
+# %% ../nbs/22_latency.ipynb 5
+def _down(h): return (h - 1) // 2 + 1
+
+def model_units(
+    cfg, # Dict with the `ResnetNN` arguments `stem_sizes`, `widths`, `depths` and optionally `reduction`
+    img_channels=3, # Number of channels of the images
+    size=32, # Height and width of the images
+    num_classes=10 # Number of classes
+):
+    "Returns a list of `(key, module factory, input shape)`, one per unit of the `ResnetNN` built from `cfg`."
+    red, stem = cfg.get('reduction', 4), [img_channels, *cfg['stem_sizes']]
+    h = _down(_down(size)) # <----- strided first convolution and max pooling
+    units = [(f'stem {stem} {size}', lambda: ResnetStem(stem), (img_channels, size, size))]
+    c = stem[-1]
+    for i, (w, d) in enumerate(zip(cfg['widths'], cfg['depths'])):
+        for j in range(d):
+            stride = 2 if i > 0 and j == 0 else 1
+            units.append((f'block {c} {w} r{red} s{stride} {h}', fc.bind(BottleneckBlock, c, w, reduction=red, stride=stride), (c, h, h)))
+            if stride == 2: h = _down(h)
+            c = w
+    units.append((f'head {c} {num_classes} {h}', lambda: nn.Sequential(nn.AdaptiveAvgPool2d(1), nn.Flatten(), nn.Linear(c, num_classes)), (c, h, h)))
+    return units
+
+# %% ../nbs/22_latency.ipynb 8
+class LatencyTable:
+    """
+        Table of the measured inference latency, parameters and MACs of the
+        units of `ResnetNN` models, cached per host, which predicts the
+        latency and size of whole models without running them.
+    """
+    def __init__(
+        self,
+        img_channels=3, # Number of channels of the images
+        size=32, # Height and width of the images
+        num_classes=10, # Number of classes
+        bs=1, # Batch size at serving time
+        n=50, # Number of timed forward passes per unit
+        warmup=5, # Number of forward passes before timing
+        cache='~/.cache/miniai/latency.json', # JSON file of the tables of all hosts, or None to not cache
+        key='' # Extra key identifying the setup, e.g. the type of normalisation
+    ):
+        fc.store_attr()
+        self.host = host_key(f'{key}|{torch.get_num_threads()}threads|bs{bs}')
+        self.entries = self._load_cache().get(self.host, {})
+        
+    def _load_cache(self):
+        if self.cache is None or not Path(self.cache).expanduser().exists(): return {}
+        return json.loads(Path(self.cache).expanduser().read_text())
+    
+    def _save_cache(self):
+        if self.cache is None: return
+        path = Path(self.cache).expanduser()
+        cache = self._load_cache()
+        cache[self.host] = self.entries
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp, path)
+        
+    @torch.inference_mode()
+    def measure(self, module, shape):
+        "Times `module` on a random batch of inputs of `shape`, and counts its parameters and MACs."
+        module.eval()
+        x = torch.randn(self.bs, *shape)
+        macs = []
+        hooks = [m.register_forward_hook(lambda m, i, o: macs.append(count_macs(m, i, o)[0])) for m in module.modules() if not list(m.children())]
+        module(x)
+        for h in hooks: h.remove()
+        for _ in range(self.warmup): module(x)
+        times = []
+        for _ in range(self.n):
+            start = time.perf_counter()
+            module(x)
+            times.append(time.perf_counter() - start)
+        return {'median': float(np.median(times)), 'p99': float(np.percentile(times, 99)), 
+                'params': sum(p.numel() for p in module.parameters()), 'macs': sum(macs) // self.bs}
+    
+    def units(self, cfg):
+        "Returns the table entries of the units of `cfg`, measuring (and caching) the missing ones."
+        units, new = model_units(cfg, self.img_channels, self.size, self.num_classes), False
+        for k, make, shape in units:
+            if k not in self.entries: self.entries[k], new = self.measure(make(), shape), True
+        if new: self._save_cache()
+        return [dict(unit=k, **self.entries[k]) for k, _, _ in units]
+    
+    def predict(self, cfg):
+        "Predicted median and 99th percentile latency in milliseconds, parameters and MACs of the `ResnetNN` built from `cfg`."
+        df = pd.DataFrame(self.units(cfg))
+        return {'latency ms': 1e3 * df['median'].sum(), 'p99 ms': 1e3 * df['p99'].sum(), 'params': int(df['params'].sum()), 'macs': int(df['macs'].sum())}
+    
+    def model(self, cfg):
+        "The `ResnetNN` built from `cfg`."
+        return ResnetNN(self.img_channels, cfg['stem_sizes'], cfg['widths'], cfg['depths'], self.num_classes, reduction=cfg.get('reduction', 4))
+    
+    def measure_model(self, cfg):
+        "Measured median and 99th percentile latency in milliseconds of the `ResnetNN` built from `cfg`, e.g. to check the predictions."
+        res = self.measure(self.model(cfg), (self.img_channels, self.size, self.size))
+        return {'latency ms': 1e3 * res['median'], 'p99 ms': 1e3 * res['p99']}
+    
+    def search(
+        self,
+        budget, # Latency budget in milliseconds
+        p99=False, # If true, the budget applies to the predicted 99th percentile latency rather than the median
+        by='params', # Capacity to maximise, 'params' or 'macs'
+        **space # Lists of values of `stem_sizes`, `widths`, `depths` and `reduction`, whose combinations are searched
+    ):
+        "Returns a DataFrame of the configurations of `space` within the latency `budget`, by decreasing capacity."
+        rows = [{**cfg, **self.predict(cfg)} for cfg in grid(**space) if len(cfg['widths']) == len(cfg['depths'])]
+        df = pd.DataFrame(rows)
+        df = df[df['p99 ms' if p99 else 'latency ms'] <= budget]
+        return df.sort_values(by, ascending=False).reset_index(drop=True)
+
+# %% ../nbs/22_latency.ipynb 10
+def fine_rank(
+    table, # `LatencyTable` that builds the models
+    cands, # DataFrame returned by `LatencyTable.search`
+    dls, # DataLoaders of the task
+    top=3, # Number of candidates trained
+    epochs=1, # Number of epochs of each run
+    lr=0.1, # Learning rate
+    learner=BaseLearner, # Learner class
+    cbs=None, # Function returning the list of callbacks of a run, which must include a `MetricsCB` with an 'accuracy' metric (defaults to just that)
+    **kwargs # Passed on to the learner
+):
+    "Trains the `top` candidates briefly and returns them with their validation loss and accuracy, by decreasing accuracy."
+    if cbs is None: cbs = lambda: [MetricsCB(accuracy=MulticlassAccuracy())]
+    rows = []
+    for _, c in cands.head(top).iterrows():
+        torch.manual_seed(0)
+        learn = learner(dls, table.model(c), cbs=cbs(), **kwargs)
+        learn.fit(lr, epochs)
+        metrics = next(cb for cb in learn.cbs if isinstance(cb, MetricsCB))
+        rows.append({**c, 'valid loss': metrics.log['Valid loss'].iloc[-1], 'accuracy': metrics.log['Accuracy'].iloc[-1]})
+    return pd.DataFrame(rows).sort_values('accuracy', ascending=False).reset_index(drop=True)
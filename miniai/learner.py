@@ -1,12 +1,13 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/03_learner.ipynb.
 
 # %% auto 0
-__all__ = ['CancelFitException', 'CancelBatchException', 'CancelEpochException', 'CancelFull_EpochException', 'Learner',
-           'Callback', 'to_cpu', 'MetricsCB', 'ProgressCB', 'get_device', 'DeviceCB', 'BaseLearner', 'MomentumLearner',
-           'LRFinderCB']
+__all__ = ['CancelFitException', 'CancelBatchException', 'CancelEpochException', 'CancelFull_EpochException', 'get_rng_state',
+           'set_rng_state', 'Learner', 'Callback', 'to_cpu', 'MetricsCB', 'ProgressCB', 'get_device', 'DeviceCB',
+           'BaseLearner', 'MomentumLearner', 'LRFinderCB']
 
 # %% ../nbs/03_learner.ipynb 3
-import math, torch, matplotlib.pyplot as plt, numpy as np
+import copy, math, random, sys, time, torch, matplotlib.pyplot as plt, numpy as np
+from pathlib import Path
 from operator import itemgetter
 import fastcore.all as fc
 
@@ -30,7 +31,7 @@ from .conv import *
 from .datasets import *
 from nbdev.showdoc import *
 
-from fastprogress.fastprogress import master_bar, progress_bar
+from fastprogress.fastprogress import master_bar, progress_bar, IN_NOTEBOOK
 
 # %% ../nbs/03_learner.ipynb 11
 class CancelFitException(Exception): pass
@@ -42,11 +43,31 @@ class CancelFull_EpochException(Exception): pass
 from torch.optim import lr_scheduler
 
 # %% ../nbs/03_learner.ipynb 14
+def get_rng_state():
+    """
+        Returns the state of every random number generator used in training,
+        so that a run can be resumed with identical results.
+    """
+    return {
+        'torch': torch.get_rng_state(), 'cuda': torch.cuda.get_rng_state_all() if torch.cuda.is_available() else [],
+        'numpy': np.random.get_state(), 'random': random.getstate()
+    }
+
+def set_rng_state(state):
+    torch.set_rng_state(state['torch'])
+    if state['cuda']: torch.cuda.set_rng_state_all(state['cuda'])
+    np.random.set_state(state['numpy'])
+    random.setstate(state['random'])
+
+# %% ../nbs/03_learner.ipynb 15
 class Learner:
     """
         Main flexible learner class that enables modular functionality to be added on.
         It does so with a context manager, which wraps function calls with 'before' and 
-        'after' callbacks, within which functionality can be added.
+        'after' callbacks, within which functionality can be added. 'cleanup' callbacks
+        always run, even when the step is cancelled or an exception is raised.
+        An extra 'after_backward' callback runs between the backward pass and
+        the optimiser step.
     """
     def __init__(
         self, 
@@ -68,25 +89,42 @@ class Learner:
             yield
             self.callback(f"after_{name}")
         except globals()[f'Cancel{name.title()}Exception']: pass
+        finally: self.callback(f"cleanup_{name}")
         
-    def fit(self, lr, epochs, lr_find=False):
+    def fit(self, lr, epochs, lr_find=False, resume_from=None):
         self.lr, self.n_epochs, self.epochs = lr, epochs, range(epochs)
         self.opt = self.opt_func(self.model.parameters(), self.lr)
-        if self.scheduler is not None and not lr_find: 
+        self.resume_state = torch.load(resume_from, weights_only=False) if isinstance(resume_from, (str, Path)) else resume_from
+        if self.resume_state is not None: self.epochs = range(self.resume_state['epoch'], epochs)
+        if self.scheduler is not None and not lr_find and self.scheduler not in (self.cbs or []): 
             self.scheduler.learn = self
-            self.cbs = self.cbs + [self.scheduler]
+            self.cbs = (self.cbs or []) + [self.scheduler]
         with self.callback_context('fit'):
             for self.epoch in self.epochs:
                 with self.callback_context('full_epoch'):
                     self._one_epoch(train=True)
                     self._one_epoch(train=False)
         
+    def validate(self):
+        """
+            Runs a single pass over the validation set with the callbacks, and
+            no training, e.g. to report the metrics of a model trained elsewhere.
+        """
+        self.n_epochs, self.epochs, self.opt, self.resume_state = 1, range(1), None, None
+        with self.callback_context('fit'):
+            for self.epoch in self.epochs:
+                with self.callback_context('full_epoch'): self._one_epoch(train=False)
+        
     def _one_epoch(self, train):
-        self.model.training = train
+        self.model.train(train)
         if train: self.dl = self.dls.train
         else: self.dl = self.dls.valid
         with self.callback_context('epoch'):
-            for self.batch in self.dl:
+            if train and self.resume_state is not None: self._resume()
+            elif train: self.epoch_rng = get_rng_state()
+            batches = enumerate(self.dl)
+            if train and self.resume_state is not None: batches = self._skip(batches)
+            for self.iter, self.batch in batches:
                 with self.callback_context('batch'):
                     self._one_batch()
         
@@ -96,15 +134,83 @@ class Learner:
         self.get_loss()
         if self.model.training:
             self.backward()
+            self.callback('after_backward') # <----- e.g. to inspect or clip gradients, raise `CancelBatchException` to skip the step
             self.step()
             self.zero_grad()
             
-    def lr_find(self, lr_start=0.00001, gamma=1.3):
-        lrf = LRFinderCB(gamma)
-        lrf.learn = self
-        self.cbs = self.cbs + [lrf]
-        self.fit(lr_start, 1, lr_find=True)
-        del(self.cbs[-1])
+    def state_dict(
+        self,
+        epoch=None, # Epoch to resume from, defaults to the current epoch
+        iter=0 # Number of training batches of `epoch` already completed
+    ):
+        """
+            Returns everything needed to resume training at a given position:
+            model and optimiser state, RNG states and the state of any callback
+            that implements `state_dict`.
+        """
+        rng = get_rng_state()
+        return {
+            'epoch': self.epoch if epoch is None else epoch, 'iter': iter,
+            'model': self.model.state_dict(), 'opt': self.opt.state_dict(),
+            'rng': rng, 'epoch_rng': self.epoch_rng if iter else rng,
+            'cbs': {type(cb).__name__: cb.state_dict() for cb in self.cbs or [] if hasattr(cb, 'state_dict')}
+        }
+    
+    def load_state_dict(self, state):
+        self.model.load_state_dict(state['model'])
+        self.opt.load_state_dict(state['opt'])
+        for cb in self.cbs or []:
+            if type(cb).__name__ in state['cbs']: cb.load_state_dict(state['cbs'][type(cb).__name__])
+    
+    def _resume(self):
+        self.load_state_dict(self.resume_state)
+        self.epoch_rng = self.resume_state['epoch_rng']
+        set_rng_state(self.epoch_rng)
+    
+    def _skip(self, batches):
+        for _ in range(self.resume_state['iter']): next(batches)
+        if self.resume_state['iter']: set_rng_state(self.resume_state['rng']) # <----- at the start of an epoch, `rng` predates the batch iterator
+        self.resume_state = None
+        return batches
+            
+    def lr_find(
+        self, 
+        lr_start=0.00001, # Learning rate of the first step
+        lr_end=10, # Learning rate reached after `max_steps` steps
+        max_steps=100, # Maximum number of steps
+        div=4, # The search stops once the smoothed loss is more than `div` times its minimum
+        beta=0.98, # Smoothing factor of the loss
+        restore=True, # If true, the weights, RNG and callback states are rolled back afterwards
+        plot=False # If true, the loss is plotted against the learning rate
+    ):
+        """
+            Runs the LR finder on a fresh optimiser, after taking an in-memory
+            snapshot of the model, RNG and callback states that is restored
+            afterwards, so that training can start from the original weights.
+            Only the callbacks with `in_lr_find` set (those that change the
+            batches or the loss, e.g. `DeviceCB`) run during the search.
+            Returns the suggested learning rate, and the learning rates and
+            smoothed losses of the curve.
+        """
+        if restore:
+            snap = {'model': {k: v.detach().clone() for k, v in self.model.state_dict().items()}, 'training': self.model.training,
+                    'rng': get_rng_state(), 'attrs': dict(self.__dict__), # <----- `fit` replaces the optimiser, so the old one is left untouched
+                    'cbs': [copy.deepcopy(cb.state_dict()) if cb.in_lr_find and hasattr(cb, 'state_dict') else None for cb in self.cbs or []]}
+        lrf = LRFinderCB(lr_end=lr_end, max_steps=max_steps, div=div, beta=beta)
+        lrf.learn, cbs = self, self.cbs
+        self.cbs = [cb for cb in cbs or [] if cb.in_lr_find] + [lrf] # <----- no metrics, checkpoints or weight averages of the search
+        try: self.fit(lr_start, math.ceil(max_steps / len(self.dls.train)), lr_find=True)
+        finally:
+            self.cbs = cbs
+            if restore:
+                self.__dict__.clear(); self.__dict__.update(snap['attrs'])
+                with torch.no_grad(): self.model.load_state_dict(snap['model'])
+                self.model.train(snap['training'])
+                set_rng_state(snap['rng'])
+                for cb, state in zip(self.cbs or [], snap['cbs']):
+                    if state is not None: cb.load_state_dict(state)
+        if plot: lrf.plot()
+        return lrf.suggestion(), lrf.lrs, lrf.losses
             
     def callback(self, name): 
         if self.cbs is not None:
@@ -112,17 +218,19 @@ class Learner:
                 method = getattr(cb, name, None)
                 if method is not None: method()
 
-# %% ../nbs/03_learner.ipynb 16
+# %% ../nbs/03_learner.ipynb 17
 class Callback(): 
     """
         Base callback class establishing that callbacks can have an order.
         Callbacks inherit from this class and optionally update the order 
         parameter, to enable sequential ordering of callback functions that 
-        depend on each other.
+        depend on each other. Callbacks that change the batches or the
+        loss set `in_lr_find`, so that `Learner.lr_find` runs them too.
     """
     order = 0
+    in_lr_find = False
 
-# %% ../nbs/03_learner.ipynb 18
+# %% ../nbs/03_learner.ipynb 19
 def to_cpu(b):
     """
         Returns data to the CPU.
@@ -131,7 +239,7 @@ def to_cpu(b):
     if isinstance(b, tuple): return tuple(to_cpu(list(b)))
     return b.detach().cpu()
 
-# %% ../nbs/03_learner.ipynb 19
+# %% ../nbs/03_learner.ipynb 20
 class MetricsCB(Callback):
     """
         Establishes and calculates metrics for training, and prints them
@@ -148,53 +256,97 @@ class MetricsCB(Callback):
         print(self.log)
     def before_fit(self):
         self.learn.metrics = self
+    @property
+    def columns(self): return ["Train loss", "Valid loss", "Accuracy"]
     def before_full_epoch(self):
-        self.log = pd.DataFrame({
-            "Train loss": 0,
-            "Valid loss": 0,
-            "Accuracy": 0
-        }, index=range(self.learn.epoch, self.learn.epoch+1))
+        self.log = pd.DataFrame(math.nan, index=range(self.learn.epoch, self.learn.epoch+1), columns=self.columns)
     def before_epoch(self): [o.reset() for o in self.all_metrics.values()]
     def after_batch(self):
         x, y = to_cpu(self.learn.batch)
         self.metrics['accuracy'].update(to_cpu(self.learn.preds), y)
         self.metrics['loss'].update(to_cpu(self.learn.loss), weight=len(x))
     def after_epoch(self): 
+        if not self.all_metrics['loss'].weights: return # <----- no batches were seen, e.g. a skipped validation
         if self.learn.model.training: self.log['Train loss'] = round(float(self.all_metrics['loss'].compute().detach()), 4)
         if not self.learn.model.training: 
             self.log['Valid loss'] = round(float(self.all_metrics['loss'].compute().detach()), 4)
             self.log['Accuracy'] = round(float(self.all_metrics['accuracy'].compute().detach()), 4)
+    def state_dict(self): 
+        return {'epoch': self.learn.epoch, 'log': self.log, 'metrics': {k: o.state_dict() for k, o in self.all_metrics.items()}}
+    def load_state_dict(self, state):
+        # accumulated metrics only carry over when resuming part way through the same epoch
+        if state['epoch'] != self.learn.epoch: return
+        self.log = state['log']
+        for k, o in self.all_metrics.items(): o.load_state_dict(state['metrics'][k])
     def after_full_epoch(self):
         # log = {k:f"{v.compute():.3f}" for k, v in self.all_metrics.items()}
         self._log()
 
-# %% ../nbs/03_learner.ipynb 21
+# %% ../nbs/03_learner.ipynb 22
 class ProgressCB(Callback):
     """
         Handles progress bars during training, and an optional plot parameter 
-        plots the change in loss across training steps.
+        plots the change in loss across training steps. Bars are redrawn at most
+        `max_rate` times per second, and losses are recorded into a buffer on the
+        device that is only synced every `flush_every` steps. In headless mode,
+        compact log lines are written instead of bars.
     """
     order = MetricsCB.order + 1
     def __init__(
         self, 
-        plot=False # If true, plots the change in loss across training steps
+        plot=False, # If true, plots the change in loss across training steps
+        max_rate=4, # Maximum number of times per second the progress bar is redrawn
+        flush_every=64, # Number of steps between copies of the recorded losses to the host
+        headless=None, # If true, writes log lines instead of bars. If None, used when output is neither a terminal nor a notebook
+        log_every=30 # Number of seconds between log lines in headless mode
     ): 
-        self.plot = plot
+        fc.store_attr()
+        if headless is None: self.headless = not (IN_NOTEBOOK or sys.stdout.isatty())
         if plot: self.losses, self.counter = [], 0
         
-    def before_fit(self): self.learn.epochs = master_bar(self.learn.epochs, total=self.learn.n_epochs)
+    def before_fit(self): 
+        if not self.headless: self.learn.epochs = self.mbar = master_bar(self.learn.epochs, total=self.learn.n_epochs)
+        if self.plot: self.buf, self.n_buf = None, 0
     
     def before_epoch(self):
-        self.learn.dl = progress_bar(self.learn.dl, leave=False, total=len(self.learn.dl))
+        self.total, self.start, self.last_draw = len(self.learn.dl), time.monotonic(), time.monotonic()
+        if not self.headless:
+            self.pbar = progress_bar(range(self.total), parent=self.mbar, leave=False)
+            self.pbar.update(0)
+        
     def after_batch(self):
-        if self.plot and self.learn.model.training:
-            self.losses.append(float(self.learn.loss.detach()))
-            self.counter += 1
+        if self.plot and self.learn.model.training: self._record(self.learn.loss)
+        now = time.monotonic()
+        if now - self.last_draw >= (self.log_every if self.headless else 1/self.max_rate): self._draw(self.learn.iter+1, now)
+        
+    def after_epoch(self): self._draw(self.total, time.monotonic())
+    
+    def _draw(self, i, now):
+        self.last_draw = now
+        if not self.headless: return self.pbar.update(i)
+        stage = 'train' if self.learn.model.training else 'valid'
+        line = f"epoch {self.learn.epoch+1}/{self.learn.n_epochs} {stage} {i}/{self.total} | {now-self.start:.1f}s | {i/max(now-self.start, 1e-6):.1f} it/s"
+        if self.plot and self.losses: line += f" | loss {self.losses[-1]:.4f}"
+        print(line, flush=True)
+        
+    def _record(self, loss):
+        if self.buf is None: self.buf = torch.empty(self.flush_every, device=loss.device)
+        self.buf[self.n_buf] = loss.detach() # <----- copied on the device, so there is no sync with the host
+        self.n_buf += 1
+        if self.n_buf == self.flush_every: self._flush()
+            
+    def _flush(self):
+        if self.n_buf: self.losses += self.buf[:self.n_buf].tolist()
+        self.counter, self.n_buf = len(self.losses), 0
     
     def after_fit(self):
         if self.plot:
+            self._flush()
             self._plot()
             
+    def cleanup_fit(self):
+        if self.plot: self._flush()
+            
     def _plot(self):
         fig, ax = plt.subplots(figsize=(4, 4))
         ax.plot(range(self.counter), self.losses)
@@ -202,7 +354,7 @@ class ProgressCB(Callback):
         ax.set_xlabel('Steps')
         ax.set_ylabel('Loss')
 
-# %% ../nbs/03_learner.ipynb 23
+# %% ../nbs/03_learner.ipynb 25
 def get_device():
     """
         Returns the available device in the current environment as
@@ -213,18 +365,19 @@ def get_device():
     else: device = 'cpu'
     return device
 
-# %% ../nbs/03_learner.ipynb 24
+# %% ../nbs/03_learner.ipynb 26
 class DeviceCB(Callback):
     """
         Sends both the model and batch data to the device.
     """
+    in_lr_find = True
     def __init__(self): self.device = get_device()
     def before_fit(self): self.learn.model.to(self.device)
     def before_batch(self): 
         xb, yb = self.learn.batch
         self.learn.batch = (xb.to(self.device), yb.to(self.device))
 
-# %% ../nbs/03_learner.ipynb 26
+# %% ../nbs/03_learner.ipynb 28
 class BaseLearner(Learner):
     """
         Flexible training subclass that handles key training functionality
@@ -236,7 +389,7 @@ class BaseLearner(Learner):
     def step(self): self.opt.step()
     def zero_grad(self): self.opt.zero_grad()
 
-# %% ../nbs/03_learner.ipynb 29
+# %% ../nbs/03_learner.ipynb 33
 class MomentumLearner(BaseLearner):
     """
         Training subclass which implements momentum in a memory-efficient
@@ -250,33 +403,68 @@ class MomentumLearner(BaseLearner):
         with torch.no_grad():
             for p in self.model.parameters(): p.grad *= self.mom
 
-# %% ../nbs/03_learner.ipynb 32
-from torch.optim.lr_scheduler import ExponentialLR
-
-# %% ../nbs/03_learner.ipynb 33
+# %% ../nbs/03_learner.ipynb 36
 class LRFinderCB(Callback):
     """
         Finds a suitable learning rate for the training data, by
         implementing Leslie Smith's learning rate finder algorithm. The
-        learning rate is increased exponentially by a scalar until the loss 
-        skyrockets, and a graph of loss vs. learning rate is returned.
+        learning rate is increased exponentially until the smoothed loss
+        diverges, or `max_steps` is reached. The curve is kept in `lrs` and 
+        `losses`, and can be plotted with `plot`.
     """
-    def __init__(self, gamma=1.3): self.gamma = gamma
+    def __init__(
+        self, 
+        gamma=None, # Factor applied to the learning rate at each step, defaults to reaching `lr_end` in `max_steps` steps
+        lr_end=10, # Learning rate reached after `max_steps` steps
+        max_steps=100, # Maximum number of steps
+        div=4, # The search stops once the smoothed loss is more than `div` times its minimum
+        beta=0.98, # Smoothing factor of the loss
+        check_every=4 # Number of steps between reads of the losses from the device
+    ): fc.store_attr()
+        
     def before_fit(self): 
-        self.lrs, self.losses = [], []
-        self.min = math.inf
-        self.sched = ExponentialLR(self.learn.opt, self.gamma)
+        self.lrs, self.raw_losses, self.losses, self.pending = [], [], [], []
+        self.avg, self.min, self.lr = 0., math.inf, self.learn.lr
+        self.mult = self.gamma or (self.lr_end / self.learn.lr) ** (1 / self.max_steps)
+        
+    def _set_lr(self, lr):
+        # Pytorch optimisers keep the learning rate in their param groups, the miniai ones (see `SGD`) in `lr`
+        opt = self.learn.opt
+        if hasattr(opt, 'param_groups'): 
+            for g in opt.param_groups: g['lr'] = lr
+        else: opt.lr = lr
+        
+    def before_batch(self):
+        if not self.learn.model.training: raise CancelEpochException() # <----- skips validation
+        
+    def _update(self):
+        if not self.pending: return
+        for loss in torch.stack(self.pending).float().tolist():
+            self.raw_losses.append(loss)
+            self.avg = self.beta * self.avg + (1 - self.beta) * loss
+            self.losses.append(self.avg / (1 - self.beta ** len(self.raw_losses)))
+            self.min = min(self.min, self.losses[-1])
+        self.pending = []
         
     def after_batch(self):
-        if not self.learn.model.training: raise CancelEpochException()
-        self.lrs.append(self.learn.opt.param_groups[0]['lr'])
-        loss = to_cpu(self.learn.loss)
-        self.losses.append(loss)
-        if loss < self.min: self.min = loss
-        if loss > self.min*3: 
-            plt.plot(self.lrs, self.losses)
-            plt.xscale('log')
-            plt.xlabel('Learning Rate')
-            plt.ylabel('Loss')
-            raise CancelFitException()
-        self.sched.step()
+        self.lrs.append(self.lr)
+        self.pending.append(self.learn.loss.detach())
+        if len(self.lrs) >= self.max_steps or len(self.lrs) % self.check_every == 0:
+            self._update()
+            if len(self.lrs) >= self.max_steps or not math.isfinite(self.losses[-1]) or self.losses[-1] > self.div * self.min: 
+                raise CancelFitException()
+        self.lr *= self.mult
+        self._set_lr(self.lr)
+        
+    def cleanup_fit(self): self._update()
+        
+    def suggestion(self, skip_start=10):
+        "A tenth of the learning rate with the lowest smoothed loss, ignoring the first (noisiest) steps."
+        start = min(skip_start, len(self.losses) - 1)
+        return self.lrs[min(range(start, len(self.losses)), key=self.losses.__getitem__)] / 10
+        
+    def plot(self):
+        plt.plot(self.lrs, self.losses)
+        plt.xscale('log')
+        plt.xlabel('Learning Rate')
+        plt.ylabel('Loss')
@@ -0,0 +1,122 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/21_memory.ipynb.
+
+# %% auto 0
+__all__ = ['model_hooks', 'MemoryTrackerCB']
+
+# %% ../nbs/21_memory.ipynb 2
+import gc, inspect, tracemalloc, warnings, functools, torch, pandas as pd
+import fastcore.all as fc
+from torch import nn
+
+from .core import *
+from .learner import *
+from .activations import Hook
+
+# %% ../nbs/21_memory.ipynb 5
+def model_hooks(model):
+    "List of `(module name, Hook)` for the miniai hooks registered on the modules of `model`."
+    res = []
+    for name, m in model.named_modules():
+        for d in (m._forward_hooks, m._forward_pre_hooks, m._backward_hooks):
+            for fn in d.values():
+                if isinstance(fn, functools.partial) and fn.args and isinstance(fn.args[0], Hook): res.append((name or 'model', fn.args[0]))
+    return res
+
+def _owned_hooks(cbs):
+    owned = set()
+    for cb in cbs:
+        for v in vars(cb).values():
+            for h in (v if isinstance(v, (list, tuple)) else [v]): 
+                if isinstance(h, Hook): owned.add(id(h))
+    return owned
+
+# %% ../nbs/21_memory.ipynb 7
+class MemoryTrackerCB(Callback):
+    """
+        Records host, device and retained tensor memory at each phase of
+        training, warns about steady growth across epochs, reports what
+        holds the most tensor memory, and optionally reclaims leaked hooks
+        and batch references after each fit.
+    """
+    order = 99 # <----- after the other callbacks, so that their `after_` methods have run
+    def __init__(
+        self,
+        growth_epochs=3, # Number of consecutive training epochs of growth that count as a leak
+        rss_tol=2**20, # Growth of the host RSS or device memory per epoch, in bytes, below which it is ignored
+        trace=False, # If true, `tracemalloc` traces Python allocations (slow), and the top ones of each epoch are kept
+        top=5, # Number of allocation sites kept per epoch when tracing
+        reclaim=False, # If true, `reclaim` runs at the end of each fit
+        device=None # Device whose allocator is tracked, defaults to the device of the model
+    ): fc.store_attr()
+        
+    def before_fit(self):
+        self.records, self.top_allocs, self.leaks = [], {}, []
+        self.started = self.trace and not tracemalloc.is_tracing()
+        if self.started: tracemalloc.start()
+        self.snapshot = tracemalloc.take_snapshot() if self.trace else None
+        self.last_holders = None
+        self._record('before_fit')
+    
+    def _record(self, phase):
+        dev = self.device or next(self.learn.model.parameters()).device
+        self.prev_holders, self.last_holders = getattr(self, 'last_holders', None), self.holders()['bytes']
+        rec = {'phase': phase, 'epoch': getattr(self.learn, 'epoch', 0), 'rss': host_rss(), 'held': self.last_holders.sum(), **device_mem_stats(dev)}
+        if self.trace: rec['traced'] = tracemalloc.get_traced_memory()[0]
+        self.records.append(rec)
+        
+    def after_epoch(self):
+        self._record('after_train' if self.learn.model.training else 'after_valid')
+        if not self.learn.model.training: return
+        if self.trace:
+            snap = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, f) for f in (tracemalloc.__file__, inspect.getfile(tensor_bytes))])
+            self.top_allocs[self.learn.epoch] = snap.compare_to(self.snapshot, 'lineno')[:self.top]
+            self.snapshot = snap
+        self._check_growth()
+        
+    def _check_growth(self):
+        df = self.df[self.df.phase == 'after_train']
+        if len(df) <= self.growth_epochs: return
+        for col in ('held', 'rss', 'allocated', 'traced'):
+            if col not in df or col in self.leaks: continue
+            diffs = df[col].diff().iloc[-self.growth_epochs:]
+            if (diffs > (0 if col == 'held' else self.rss_tol)).all():
+                self.leaks.append(col)
+                grown = self.last_holders.sub(self.prev_holders, fill_value=0).sort_values(ascending=False) # <----- since the end of the validation epoch before
+                grown = ', '.join(f'{k} (+{v / 2**10:.1f}KB)' for k, v in grown[grown > 0].items()) or 'none'
+                warnings.warn(f'{col} memory grew at each of the last {self.growth_epochs} epochs, by {diffs.sum() / 2**20:.2f}MB in total; '
+                              f'holders of tensors that grew in the last epoch: {grown}')
+            
+    def after_fit(self): self._record('after_fit')
+    def cleanup_fit(self):
+        if self.started: tracemalloc.stop()
+        if self.reclaim: self.reclaim_mem()
+    
+    @property
+    def df(self): 
+        "DataFrame of the records, one row per phase."
+        return pd.DataFrame(self.records)
+    
+    def orphaned_hooks(self):
+        "List of `(module name, Hook)` registered on the model and referred to by no callback."
+        owned = _owned_hooks(self.learn.cbs)
+        return [(n, h) for n, h in model_hooks(self.learn.model) if id(h) not in owned]
+    
+    def holders(self):
+        "DataFrame of the bytes of tensors held by each callback, each orphaned hook, and the learner's references to the last batch."
+        seen, skip = set(), (nn.Module, torch.optim.Optimizer, Learner)
+        res = {type(cb).__name__: tensor_bytes(cb, skip, seen) for cb in self.learn.cbs if cb is not self}
+        for i, (name, h) in enumerate(self.orphaned_hooks()): res[f'orphaned hook {i} on {name}'] = tensor_bytes(h, skip, seen)
+        res['learner (last batch)'] = tensor_bytes([getattr(self.learn, k, None) for k in ('batch', 'xb', 'yb', 'preds', 'loss')], skip, seen)
+        return pd.DataFrame({'bytes': pd.Series(res, dtype='int64')}).sort_values('bytes', ascending=False)
+    
+    def reclaim_mem(self):
+        "Removes orphaned hooks, drops the learner's references to the last batch, and frees cached memory. Returns the bytes of tensors released."
+        before = self.holders()['bytes'].sum()
+        for _, h in self.orphaned_hooks(): 
+            h.remove()
+            if hasattr(h, 'stats'): del h.stats
+        for k in ('batch', 'xb', 'yb', 'preds', 'loss'): 
+            if hasattr(self.learn, k): delattr(self.learn, k)
+        gc.collect()
+        if torch.cuda.is_available(): torch.cuda.empty_cache()
+        return before - self.holders()['bytes'].sum()
@@ -0,0 +1,131 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/14_profiler.ipynb.
+
+# %% auto 0
+__all__ = ['count_macs', 'ProfileHook', 'Profiler', 'profile_learner']
+
+# %% ../nbs/14_profiler.ipynb 2
+import json, math, time, torch
+import pandas as pd
+import torch.nn.functional as F
+from torch import nn
+
+from .activations import Hook
+
+# %% ../nbs/14_profiler.ipynb 5
+def count_macs(m, inp, out):
+    "Returns the estimated (MACs, FLOPs) of one forward pass of a leaf module."
+    if isinstance(m, nn.modules.conv._ConvNd):
+        macs = out.numel() * m.in_channels // m.groups * math.prod(m.kernel_size)
+        return macs, 2*macs + (out.numel() if m.bias is not None else 0)
+    if isinstance(m, nn.Linear):
+        macs = out.numel() * m.in_features
+        return macs, 2*macs + (out.numel() if m.bias is not None else 0)
+    if 'Norm' in type(m).__name__: return out.numel(), 2*out.numel()
+    if isinstance(m, (nn.AvgPool2d, nn.MaxPool2d)):
+        k = m.kernel_size if isinstance(m.kernel_size, int) else math.prod(m.kernel_size)
+        return 0, out.numel() * (k*k if isinstance(m.kernel_size, int) else k)
+    if isinstance(m, nn.modules.pooling._AdaptiveAvgPoolNd): return 0, inp[0].numel()
+    if isinstance(m, (nn.ReLU, nn.LeakyReLU, nn.GELU, nn.SiLU, nn.Sigmoid, nn.Tanh)): return 0, out.numel()
+    return 0, 0
+
+# %% ../nbs/14_profiler.ipynb 7
+def _profile_fwd(hook, module, inp, out):
+    hook.fwd.append(hook.clock() - hook.start)
+    if hook.info is not None: return
+    shape = lambda o: tuple(o.shape) if torch.is_tensor(o) else None
+    macs, flops = count_macs(module, inp, out) if hook.leaf else (0, 0)
+    hook.info = {'in_shape': shape(inp[0]) if inp else None, 'out_shape': shape(out), 
+                 'act_bytes': out.numel() * out.element_size() if torch.is_tensor(out) else 0, 'macs': macs, 'flops': flops}
+    
+class ProfileHook(Hook):
+    """
+        Hook that records the shapes, operation counts and activation size of
+        a module, and times its forward and backward passes.
+    """
+    def __init__(self, name, module, sync=False):
+        super().__init__(module, _profile_fwd)
+        self.name, self.module, self.sync, self.info, self.fwd, self.bwd = name, module, sync, None, [], []
+        self.leaf = not any(True for _ in module.children())
+        self.hooks = [module.register_forward_pre_hook(self._start), 
+                      module.register_full_backward_pre_hook(self._bwd_start), module.register_full_backward_hook(self._bwd_end)]
+        
+    def clock(self):
+        if self.sync: torch.cuda.synchronize()
+        return time.perf_counter()
+    
+    def _start(self, *args): self.start = self.clock()
+    def _bwd_start(self, *args): self.bwd_start = self.clock()
+    def _bwd_end(self, *args): self.bwd.append(self.clock() - self.bwd_start)
+    
+    def reset(self): self.fwd, self.bwd = [], []
+    
+    def remove(self):
+        super().remove()
+        for h in getattr(self, 'hooks', []): h.remove()
+
+# %% ../nbs/14_profiler.ipynb 9
+class Profiler:
+    """
+        Profiles every module of a model on a batch: shapes, parameters,
+        MACs/FLOPs, activation memory and forward/backward latency.
+    """
+    def __init__(
+        self,
+        model, # Model to profile
+        loss_func=F.cross_entropy, # Loss function used for the backward pass
+        n_repeats=10, # Number of timed passes
+        warmup=2 # Number of untimed passes
+    ):
+        self.model, self.loss_func, self.n_repeats, self.warmup = model, loss_func, n_repeats, warmup
+        
+    def run(self, xb, yb):
+        "Profiles the model on a batch and returns the summary dataframe."
+        sync, xb = xb.is_cuda, xb.detach().requires_grad_() # <----- otherwise the backward hooks of the first layers fire before their gradients are computed
+        training, grads = self.model.training, [(p, p.grad) for p in self.model.parameters()]
+        bufs = [(b, b.detach().clone()) for b in self.model.buffers()] # <----- e.g. batchnorm statistics, updated by every pass in training mode
+        hooks = [ProfileHook(n, m, sync) for n, m in self.model.named_modules() if not isinstance(m, nn.Identity)]
+        try:
+            self.model.zero_grad(set_to_none=True)
+            for i in range(self.warmup + self.n_repeats):
+                if i == self.warmup: [h.reset() for h in hooks]
+                self.loss_func(self.model(xb), yb).backward()
+        finally: 
+            [h.remove() for h in hooks]
+            with torch.no_grad(): 
+                for b, v in bufs: b.copy_(v)
+            for p, g in grads: p.grad = g
+            self.model.train(training)
+        self.summary = self._table(hooks)
+        return self.summary
+    
+    def _table(self, hooks):
+        rows = {}
+        for h in hooks:
+            if h.info is None: continue # <----- modules that never ran, e.g. a `FloatFunctional`
+            leaves = [o for o in hooks if o.leaf and o.info is not None and (o is h or o.name.startswith(h.name + '.') or h.name == '')]
+            rows[h.name or 'model'] = {
+                'type': type(h.module).__name__, 'depth': h.name.count('.') + 1 if h.name else 0,
+                'in_shape': h.info['in_shape'], 'out_shape': h.info['out_shape'],
+                'params': sum(p.numel() for p in h.module.parameters()),
+                'macs': sum(o.info['macs'] for o in leaves), 'flops': sum(o.info['flops'] for o in leaves),
+                'act_bytes': sum(o.info['act_bytes'] for o in leaves),
+                'fwd_ms': 1e3 * sum(h.fwd) / self.n_repeats, 'bwd_ms': 1e3 * sum(h.bwd) / self.n_repeats
+            }
+        return pd.DataFrame.from_dict(rows, orient='index')
+    
+    def of_type(self, *types):
+        "Returns the rows of the summary for modules of the given types, e.g. `'ResnetStage'` or `'BottleneckBlock'`."
+        return self.summary[self.summary.type.isin([t if isinstance(t, str) else t.__name__ for t in types])]
+    
+    def to_json(self, fname=None):
+        "Returns the summary as JSON, a list of records with the module name, and optionally saves it."
+        res = json.dumps(self.summary.reset_index(names='name').to_dict(orient='records'), indent=1)
+        if fname is not None: 
+            with open(fname, 'w') as f: f.write(res)
+        return res
+    
+def profile_learner(learn, **kwargs):
+    "Profiles the model of a `Learner` on a batch of its training set."
+    xb, yb = next(iter(learn.dls.train))[:2]
+    device = next(learn.model.parameters()).device
+    return Profiler(learn.model, learn.loss_func, **kwargs).run(xb.to(device), yb.to(device))
@@ -0,0 +1,75 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/16_progressive.ipynb.
+
+# %% auto 0
+__all__ = ['linear_sched', 'recalibrate_bn', 'ProgressiveResizeCB']
+
+# %% ../nbs/16_progressive.ipynb 2
+import math, torch
+import torch.nn.functional as F
+import fastcore.all as fc
+from torch import nn
+
+from .learner import *
+
+# %% ../nbs/16_progressive.ipynb 5
+def linear_sched(start, end, current_step, total_steps): return start + (end - start) * current_step / total_steps
+
+@torch.no_grad()
+def recalibrate_bn(model, dl, n_batches=20, device=None):
+    "Re-estimates the running statistics of the `nn.BatchNorm2d` layers of a model on `n_batches` batches of `dl`."
+    bns = [m for m in model.modules() if isinstance(m, nn.modules.batchnorm._BatchNorm)]
+    moms = [bn.momentum for bn in bns]
+    for bn in bns: bn.reset_running_stats(); bn.momentum = None # <----- cumulative average over the batches
+    training = model.training
+    model.train()
+    for i, (xb, *_) in enumerate(dl):
+        if i == n_batches: break
+        model(xb.to(device) if device is not None else xb)
+    for bn, mom in zip(bns, moms): bn.momentum = mom
+    model.train(training)
+
+# %% ../nbs/16_progressive.ipynb 6
+class ProgressiveResizeCB(Callback):
+    """
+        Trains early epochs on downscaled batches, increasing the resolution
+        on a schedule up to the full size for the last epochs. Validation
+        runs at full resolution.
+    """
+    order = 1 # <----- after `DeviceCB`, so that batches are resized on the device
+    def __init__(
+        self,
+        start=0.5, # Size of the first epochs, as a fraction of the full size
+        end_pct=0.75, # Fraction of the epochs after which training is at full size
+        sched=linear_sched, # Schedule `sched(start, end, current_step, total_steps)`, e.g. `CosineAnneal`
+        step=8, # Sizes are rounded to a multiple of this number of pixels
+        mode='bilinear', # Interpolation mode of `F.interpolate`
+        recal_bn=0 # Number of batches used to re-estimate batchnorm statistics at full size, if training ends below it
+    ):
+        fc.store_attr()
+        
+    def before_fit(self): self.full, self.sizes = None, [] # <----- the full size is read from the first batch of each fit
+        
+    def scale(self, epoch):
+        "Returns the fraction of the full size used in `epoch`."
+        n_resize = math.ceil(self.end_pct * self.learn.n_epochs)
+        return min(self.sched(self.start, 1., epoch, n_resize), 1.) if epoch < n_resize else 1.
+        
+    def before_epoch(self):
+        if not self.learn.model.training: return
+        self.factor = self.scale(self.learn.epoch)
+        if self.full is not None: self.sizes.append(self._size())
+            
+    def _size(self): return tuple(min(f, max(self.step, round(f * self.factor / self.step) * self.step)) for f in self.full)
+    
+    def before_batch(self):
+        if not self.learn.model.training: return
+        xb, *rest = self.learn.batch
+        if self.full is None: 
+            self.full = tuple(xb.shape[-2:])
+            self.sizes.append(self._size())
+        size = self.sizes[-1]
+        if size != self.full: self.learn.batch = (F.interpolate(xb, size=size, mode=self.mode, antialias=self.mode in ('bilinear', 'bicubic')), *rest)
+            
+    def after_fit(self):
+        if self.recal_bn and self.sizes and self.sizes[-1] != self.full:
+            recalibrate_bn(self.learn.model, self.learn.dls.train, self.recal_bn, device=next(self.learn.model.parameters()).device)
@@ -0,0 +1,110 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/15_pruning.ipynb.
+
+# %% auto 0
+__all__ = ['append_channel_stats', 'ChannelStats', 'bn_scores', 'prunable_pairs', 'prune_channels', 'compare_pruned']
+
+# %% ../nbs/15_pruning.ipynb 2
+import copy, torch
+import pandas as pd
+from torch import nn
+
+from .conv import *
+from .learner import *
+from .activations import ActivationStats
+from .quantisation import time_model
+
+# %% ../nbs/15_pruning.ipynb 5
+def append_channel_stats(hook, module, inp, out, eps=1e-6):
+    """
+        Accumulates, for each channel of a layer output, the fraction of
+        activations above `eps`. Stays on the device, so it doesn't sync.
+    """
+    if not hasattr(hook, 'active'): hook.active, hook.n = 0., 0
+    hook.active = hook.active + (out.detach() > eps).float().mean((0, 2, 3))
+    hook.n += 1
+    
+class ChannelStats(ActivationStats):
+    """
+        Collects the per-channel activity of the output of every `ConvNormAct`
+        of a model, for scoring channels before pruning.
+    """
+    def __init__(self): super().__init__(append_channel_stats, layer_filter=lambda m: isinstance(m, ConvNormAct))
+    def before_fit(self):
+        super().before_fit()
+        self.names = [n for n, m in self.learn.model.named_modules() if isinstance(m, ConvNormAct)]
+    def cleanup_fit(self): [h.remove() for h in self.hooks] # <----- also when the fit is cancelled or fails
+    def scores(self): 
+        "Returns the mean activity of each channel, by module name."
+        return {n: (h.active / h.n).cpu() for n, h in zip(self.names, self.hooks) if hasattr(h, 'active')}
+    
+def bn_scores(model):
+    "Returns the absolute value of the normalisation scale of each channel of every `ConvNormAct`, by module name."
+    res = {}
+    for n, m in model.named_modules():
+        if not isinstance(m, ConvNormAct): continue
+        scale = getattr(m.block[1], 'weight', getattr(m.block[1], 'mults', None))
+        if scale is not None: res[n] = scale.detach().abs().flatten().cpu()
+    return res
+
+# %% ../nbs/15_pruning.ipynb 7
+def prunable_pairs(model):
+    "Returns the names of the `ConvNormAct` layers whose output channels can be removed, with the layer that consumes them."
+    res = []
+    for n, m in model.named_modules():
+        if isinstance(m, BottleneckBlock): res += [(f'{n}.block.0', f'{n}.block.1'), (f'{n}.block.1', f'{n}.block.2')]
+        if isinstance(m, ResnetStem):
+            cnas = [f'{n}.{i}' for i, o in enumerate(m) if isinstance(o, ConvNormAct)]
+            res += list(zip(cnas[:-1], cnas[1:]))
+    return res
+
+def _slice(t, idx, dim): return nn.Parameter(t.data.index_select(dim, idx).clone(), t.requires_grad) if isinstance(t, nn.Parameter) else t.index_select(dim, idx).clone()
+
+def _prune_out(cna, idx):
+    conv, norm = cna.block[0], cna.block[1]
+    n = conv.out_channels
+    conv.weight = _slice(conv.weight, idx, 0)
+    if conv.bias is not None: conv.bias = _slice(conv.bias, idx, 0)
+    conv.out_channels = len(idx)
+    for name, t in [*norm.named_parameters(recurse=False), *norm.named_buffers(recurse=False)]:
+        if t.dim() and n in t.shape: setattr(norm, name, _slice(t, idx, list(t.shape).index(n))) # <----- (C,) for `nn.BatchNorm2d`, (C,1,1) or (1,C,1,1) for the miniai `BatchNorm`
+    if hasattr(norm, 'num_features'): norm.num_features = len(idx)
+    if hasattr(norm, '_cache'): norm._cache = None
+
+def _prune_in(cna, idx):
+    conv = cna.block[0]
+    conv.weight = _slice(conv.weight, idx, 1)
+    conv.in_channels = len(idx)
+    
+def prune_channels(
+    model, # Model built from `ConvNormAct` layers, e.g. a `ResnetNN`
+    scores, # Dict of per-channel scores by module name, from `ChannelStats.scores` or `bn_scores`
+    amount=None, # Fraction of the channels of each prunable layer to remove, lowest scores first
+    threshold=None, # Removes the channels whose score is at most this, e.g. 0 to remove dead channels
+    min_channels=1 # Minimum number of channels kept in each layer
+):
+    """
+        Returns a copy of the model without the lowest-scoring output channels
+        of its prunable `ConvNormAct` layers, and the number of channels kept
+        in each of them.
+    """
+    model, kept = copy.deepcopy(model), {}
+    mods = dict(model.named_modules())
+    for name, next_name in prunable_pairs(model):
+        if name not in scores: continue
+        s = scores[name]
+        keep = torch.ones(len(s), dtype=torch.bool)
+        if threshold is not None: keep &= s > threshold
+        if amount is not None: keep[s.argsort()[:int(amount * len(s))]] = False
+        if keep.sum() < min_channels: keep[s.argsort(descending=True)[:min_channels]] = True
+        idx = keep.nonzero().flatten().to(mods[name].block[0].weight.device)
+        _prune_out(mods[name], idx)
+        _prune_in(mods[next_name], idx)
+        kept[name] = (len(s), len(idx))
+    return model, kept
+
+# %% ../nbs/15_pruning.ipynb 9
+def compare_pruned(model, pruned, xb, n=20):
+    "Returns a dataframe comparing the parameter counts and the forward latency on `xb` of a model and its pruned version."
+    res = {name: {'Params': sum(p.numel() for p in m.parameters()), 'Latency (ms)': time_model(m, xb, n) * 1e3} 
+           for name, m in (('original', model), ('pruned', pruned))}
+    return pd.DataFrame(res).T
@@ -0,0 +1,103 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/10_quantisation.ipynb.
+
+# %% auto 0
+__all__ = ['fuse_conv_norm_act', 'prepare_int8', 'calibrate', 'quantise', 'model_size', 'time_model', 'compare_int8']
+
+# %% ../nbs/10_quantisation.ipynb 2
+import copy, io, time, torch
+import pandas as pd
+from torch import nn
+from torch.ao.quantization import QuantWrapper, get_default_qconfig, prepare, convert, fuse_modules
+from torcheval.metrics import MulticlassAccuracy
+
+from .conv import *
+from .learner import *
+
+# %% ../nbs/10_quantisation.ipynb 5
+def fuse_conv_norm_act(model):
+    """
+        Fuses the convolution, `nn.BatchNorm2d` and `nn.ReLU` layers of every
+        `ConvNormAct` in a model, in place. The model must be in eval mode.
+    """
+    for m in model.modules():
+        if not isinstance(m, ConvNormAct): continue
+        conv, norm, act = m.block
+        if not isinstance(norm, (nn.BatchNorm2d, nn.Identity)): raise ValueError(f"Can't fuse {type(norm).__name__}, use nn.BatchNorm2d")
+        names = ['0'] + ['1']*isinstance(norm, nn.BatchNorm2d) + ['2']*isinstance(act, nn.ReLU)
+        if len(names) > 1: fuse_modules(m.block, names, inplace=True)
+    return model
+
+# %% ../nbs/10_quantisation.ipynb 6
+def prepare_int8(
+    model, # Trained float model
+    backend='x86' # Quantised engine, e.g. 'x86' or 'fbgemm' on servers and 'qnnpack' on ARM
+):
+    """
+        Returns a fused copy of the model on the CPU, wrapped in quant and
+        dequant stubs, with observers ready for calibration.
+    """
+    torch.backends.quantized.engine = backend
+    qmodel = QuantWrapper(fuse_conv_norm_act(copy.deepcopy(model).cpu().eval()))
+    qmodel.qconfig = get_default_qconfig(backend)
+    return prepare(qmodel)
+
+@torch.no_grad()
+def calibrate(model, dl, n_batches=32):
+    "Runs `n_batches` batches of `dl` through a prepared model to record activation ranges."
+    for i, (xb, _) in enumerate(dl):
+        if i == n_batches: break
+        model(xb.cpu())
+    return model
+
+def quantise(
+    model, # Trained float model, with `nn.BatchNorm2d` normalisation
+    dls, # DataLoaders, whose validation set is used for calibration
+    n_batches=32, # Number of validation batches used for calibration
+    backend='x86' # Quantised engine
+):
+    """
+        Post-training static quantisation: fuses, calibrates on the validation
+        set and returns an int8 copy of the model, which runs on the CPU.
+    """
+    return convert(calibrate(prepare_int8(model, backend), dls.valid, n_batches)).eval()
+
+# %% ../nbs/10_quantisation.ipynb 8
+def model_size(model):
+    "Returns the size in bytes of the saved `state_dict` of a model."
+    buf = io.BytesIO()
+    torch.save(model.state_dict(), buf)
+    return buf.tell()
+
+@torch.no_grad()
+def time_model(model, x, n=20, warmup=3):
+    "Returns the mean time in seconds of a forward pass of `model` on `x`."
+    model.eval()
+    for _ in range(warmup): model(x)
+    start = time.perf_counter()
+    for _ in range(n): model(x)
+    return (time.perf_counter() - start) / n
+
+def compare_int8(
+    fp32, # Float model, moved to the CPU
+    int8, # Quantised model returned by `quantise`
+    dls, # DataLoaders, whose validation set is used for accuracy and timings
+    n=20 # Number of timed forward passes
+):
+    """
+        Returns a dataframe comparing the validation loss and accuracy,
+        single-sample latency, batch throughput and size of a float model
+        and its quantised version on the CPU.
+    """
+    xb = next(iter(dls.valid))[0].cpu()
+    res = {}
+    for name, model in (('fp32', fp32.cpu().eval()), ('int8', int8)):
+        learn = BaseLearner(dls, model, cbs=[MetricsCB(accuracy=MulticlassAccuracy())])
+        learn.validate()
+        log = learn.metrics.log.iloc[0]
+        res[name] = {
+            'Valid loss': log['Valid loss'], 'Accuracy': log['Accuracy'],
+            'Latency (ms)': time_model(model, xb[:1], n) * 1e3,
+            'Throughput (samples/s)': len(xb) / time_model(model, xb, n),
+            'Size (MB)': model_size(model) / 2**20
+        }
+    return pd.DataFrame(res).T
@@ -0,0 +1,286 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/11_serving.ipynb.
+
+# %% auto 0
+__all__ = ['DynamicBatcher', 'http_response', 'encode_array', 'decode_array', 'read_message', 'InferenceServer', 'Client',
+           'load_test', 'run_sync']
+
+# %% ../nbs/11_serving.ipynb 2
+import asyncio, io, json, threading, time, torch
+import numpy as np
+import fastcore.all as fc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# %% ../nbs/11_serving.ipynb 5
+def _sample_key(x): return x.shape[1:], x.dtype
+
+class DynamicBatcher:
+    """
+        Merges concurrent prediction requests into batches and runs them
+        under `inference_mode` on a single worker thread. Keeps the latency
+        of recent requests, the batch sizes and the queue depth as metrics.
+    """
+    def __init__(
+        self,
+        model, # Trained model
+        max_batch_size=32, # Maximum number of samples in a batch
+        max_wait_ms=2., # Maximum time the first request of a batch waits for others to join
+        device='cpu', # Device the model runs on
+        n_latencies=10_000 # Number of recent requests kept for the latency percentiles
+    ):
+        fc.store_attr()
+        self.model = model.to(device).eval()
+        self.latencies, self.batch_sizes = deque(maxlen=n_latencies), deque(maxlen=n_latencies)
+        self.n_requests, self.max_depth, self.pending = 0, 0, None
+        
+    def start(self):
+        "Starts the batching loop in the running event loop."
+        self.queue, self.pool = asyncio.Queue(), ThreadPoolExecutor(1, thread_name_prefix='inference')
+        self.task = asyncio.create_task(self._loop())
+        
+    async def stop(self):
+        self.task.cancel()
+        try: await self.task
+        except asyncio.CancelledError: pass
+        self.pool.shutdown()
+        
+    async def predict(self, x):
+        "Returns the output of the model for `x`, which has a leading batch dimension."
+        fut = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((x, fut, time.perf_counter()))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return await fut
+    
+    async def _next_batch(self):
+        items = [self.pending or await self.queue.get()]
+        self.pending, n, key = None, len(items[0][0]), _sample_key(items[0][0])
+        deadline = time.perf_counter() + self.max_wait_ms / 1e3
+        while n < self.max_batch_size:
+            try: item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0: break
+                try: item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError: break
+            if n + len(item[0]) > self.max_batch_size or _sample_key(item[0]) != key: # <----- only samples of the same shape and dtype can be concatenated
+                self.pending = item
+                break
+            items.append(item)
+            n += len(item[0])
+        return items
+    
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._next_batch()
+            xs = [x for x, _, _ in items]
+            try: out = await loop.run_in_executor(self.pool, self._run, xs)
+            except Exception as e:
+                for _, fut, _ in items: 
+                    if not fut.done(): fut.set_exception(e)
+                continue
+            now = time.perf_counter()
+            for o, (_, fut, start) in zip(out.split([len(x) for x in xs]), items):
+                if not fut.done(): fut.set_result(o) # <----- the client may have gone away
+                self.latencies.append(now - start)
+            self.batch_sizes.append(len(out))
+            self.n_requests += len(items)
+            
+    def _run(self, xs):
+        with torch.inference_mode(): return self.model(torch.cat(xs).to(self.device)).cpu()
+    
+    def metrics(self):
+        "Returns latency percentiles (in ms), batch sizes and queue depths."
+        lat = np.array(self.latencies) * 1e3
+        p50, p99 = np.percentile(lat, [50, 99]) if len(lat) else (float('nan'),)*2
+        return {'requests': self.n_requests, 'batches': len(self.batch_sizes), 
+                'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else 0.,
+                'p50_ms': float(p50), 'p99_ms': float(p99),
+                'queue_depth': self.queue.qsize(), 'max_queue_depth': self.max_depth}
+
+# %% ../nbs/11_serving.ipynb 7
+_reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+
+def http_response(status, payload):
+    "Encodes a JSON HTTP/1.1 response."
+    body = json.dumps(payload).encode()
+    head = f"HTTP/1.1 {status} {_reasons[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    return head.encode() + body
+
+def encode_array(x): 
+    "Encodes a tensor or array as `.npy` bytes."
+    buf = io.BytesIO()
+    np.save(buf, np.asarray(x, dtype=np.float32))
+    return buf.getvalue()
+
+def decode_array(b): return torch.from_numpy(np.load(io.BytesIO(b), allow_pickle=False))
+
+async def read_message(reader):
+    """
+        Reads an HTTP message and returns its start line, headers and body, or
+        None if the connection was closed. Raises `ValueError` if the message
+        is malformed.
+    """
+    try: head = await reader.readuntil(b'\r\n\r\n')
+    except (asyncio.IncompleteReadError, ConnectionError): return None
+    except asyncio.LimitOverrunError: raise ValueError('headers too long')
+    start, *lines = head.decode('latin-1').rstrip().split('\r\n')
+    headers = {k.strip().lower(): v.strip() for k, v in (l.split(':', 1) for l in lines if ':' in l)}
+    length = headers.get('content-length', '0')
+    if not length.isdigit(): raise ValueError(f'invalid Content-Length: {length!r}')
+    try: return start, headers, await reader.readexactly(int(length))
+    except (asyncio.IncompleteReadError, ConnectionError): return None # <----- closed before the end of the body
+
+# %% ../nbs/11_serving.ipynb 8
+class InferenceServer:
+    """
+        Serves a model over HTTP on a TCP port or a Unix socket, merging
+        concurrent prediction requests with a `DynamicBatcher`.
+    """
+    def __init__(
+        self,
+        model, # Trained model
+        host='127.0.0.1', # Host to listen on
+        port=8000, # Port to listen on, 0 picks a free port
+        path=None, # Path of a Unix socket to listen on instead of a TCP port
+        **kwargs # Passed on to `DynamicBatcher`
+    ):
+        fc.store_attr('host,port,path')
+        self.batcher = DynamicBatcher(model, **kwargs)
+        
+    @classmethod
+    def from_checkpoint(
+        cls,
+        fname, # Checkpoint written by `CheckpointCB`, or a saved model `state_dict`
+        model, # Model with the same architecture, e.g. a `ResnetNN`
+        **kwargs # Passed on to `InferenceServer`
+    ):
+        state = torch.load(fname, map_location='cpu', weights_only=False)
+        model.load_state_dict(state['model'] if 'opt' in state else state)
+        return cls(model, **kwargs)
+    
+    async def start(self):
+        self.batcher.start()
+        if self.path is not None: self.server = await asyncio.start_unix_server(self._handle, self.path)
+        else: 
+            self.server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+        
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.batcher.stop()
+        
+    async def serve_forever(self):
+        await self.start()
+        try: await self.server.serve_forever()
+        finally: await self.close()
+            
+    def run(self): 
+        "Serves until interrupted."
+        asyncio.run(self.serve_forever())
+    
+    def start_background(self):
+        "Serves from an event loop on a background thread, e.g. from a notebook, and returns once the server is listening."
+        ready, self.loop = threading.Event(), asyncio.new_event_loop()
+        def _serve():
+            self.loop.run_until_complete(self.start())
+            ready.set()
+            self.loop.run_forever()
+        self.thread = threading.Thread(target=_serve, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+    
+    def stop_background(self):
+        asyncio.run_coroutine_threadsafe(self.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    if (msg := await read_message(reader)) is None: break
+                    start, headers, body = msg
+                    method, target, *_ = start.split(' ')
+                except ValueError as e: # <----- the rest of the stream can't be trusted, so the connection is closed after the reply
+                    writer.write(http_response(400, {'error': f'malformed request: {e}'}))
+                    await writer.drain()
+                    break
+                try: status, payload = await self._route(method, target, body)
+                except Exception as e: status, payload = 500, {'error': repr(e)}
+                writer.write(http_response(status, payload))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close': break
+        except ConnectionError: pass
+        finally: writer.close()
+        
+    async def _route(self, method, target, body):
+        if method == 'GET' and target == '/health': return 200, {'status': 'ok'}
+        if method == 'GET' and target == '/metrics': return 200, self.batcher.metrics()
+        if method != 'POST' or target != '/predict': return 404, {'error': f"{method} {target}"}
+        try: x = decode_array(body)
+        except (ValueError, TypeError) as e: return 400, {'error': str(e)}
+        if x.ndim == 0 or len(x) == 0 or x.dtype != torch.float32: 
+            return 400, {'error': f'expected a non-empty float32 array with a leading batch dimension, got {x.dtype} {tuple(x.shape)}'}
+        out = await self.batcher.predict(x)
+        return 200, {'preds': out.argmax(1).tolist(), 'logits': out.tolist()}
+
+# %% ../nbs/11_serving.ipynb 10
+class Client:
+    "Minimal asyncio HTTP client for an `InferenceServer`, over a single keep-alive connection."
+    def __init__(self, reader, writer): self.reader, self.writer = reader, writer
+        
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8000, path=None):
+        if path is not None: return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+    
+    async def request(self, method, target, body=b''):
+        self.writer.write(f"{method} {target} HTTP/1.1\r\nHost: miniai\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        start, _, body = await read_message(self.reader)
+        status = int(start.split(' ')[1])
+        if status != 200: raise RuntimeError(f"{start}: {body.decode()}")
+        return json.loads(body)
+    
+    async def predict(self, x): return await self.request('POST', '/predict', encode_array(x))
+    async def metrics(self): return await self.request('GET', '/metrics')
+    
+    async def close(self): 
+        self.writer.close()
+        await self.writer.wait_closed()
+
+# %% ../nbs/11_serving.ipynb 11
+async def load_test(
+    x, # Input of each request, with a leading batch dimension
+    host='127.0.0.1', # Host of the server
+    port=8000, # Port of the server
+    path=None, # Unix socket of the server, instead of host and port
+    concurrency=32, # Number of concurrent connections
+    n_requests=1000 # Total number of requests
+):
+    "Sends requests from concurrent connections and returns the throughput and client-side latency percentiles."
+    body, lat = encode_array(x), []
+    async def _worker(n):
+        client = await Client.connect(host, port, path)
+        for _ in range(n):
+            start = time.perf_counter()
+            await client.request('POST', '/predict', body)
+            lat.append(time.perf_counter() - start)
+        await client.close()
+    start = time.perf_counter()
+    await asyncio.gather(*[_worker(n_requests//concurrency + (i < n_requests%concurrency)) for i in range(concurrency)])
+    elapsed, lat = time.perf_counter() - start, np.array(lat) * 1e3
+    return {'requests/s': n_requests / elapsed, 'samples/s': n_requests * len(x) / elapsed, 
+            'p50_ms': float(np.percentile(lat, 50)), 'p99_ms': float(np.percentile(lat, 99))}
+
+def run_sync(coro):
+    "Runs a coroutine to completion, on a separate thread if an event loop is already running (e.g. in a notebook)."
+    try: asyncio.get_running_loop()
+    except RuntimeError: return asyncio.run(coro)
+    res = []
+    t = threading.Thread(target=lambda: res.append(asyncio.run(coro)))
+    t.start(); t.join()
+    return res[0]
@@ -0,0 +1,70 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/18_shared_loader.ipynb.
+
+# %% auto 0
+__all__ = ['TaggedBatchSampler', 'RingWriter', 'RingDataLoader']
+
+# %% ../nbs/18_shared_loader.ipynb 2
+import torch
+from torch.utils.data import DataLoader, BatchSampler, RandomSampler, SequentialSampler
+
+# %% ../nbs/18_shared_loader.ipynb 5
+class TaggedBatchSampler(BatchSampler):
+    "Batch sampler that yields `(k, indices)`, with a running batch number `k`."
+    def __init__(self, sampler, batch_size, drop_last): 
+        super().__init__(sampler, batch_size, drop_last)
+        self.count = 0
+    def __iter__(self):
+        for idxs in super().__iter__():
+            yield self.count, idxs
+            self.count += 1
+            
+def _fields(ds, sample):
+    if isinstance(sample, dict):
+        keys = list(ds.features) if hasattr(ds, 'features') else list(sample)
+        return keys, [torch.as_tensor(sample[k]) for k in keys]
+    return None, [torch.as_tensor(v) for v in sample]
+
+class RingWriter:
+    "Dataset wrapper that writes the samples of a tagged batch into a shared-memory slot, and returns the slot index."
+    def __init__(self, ds, slots, keys): self.ds, self.slots, self.keys = ds, slots, keys
+    def __len__(self): return len(self.ds)
+    def __getitems__(self, tagged):
+        k, idxs = tagged
+        slot = k % len(self.slots)
+        bufs = self.slots[slot]
+        for j, i in enumerate(idxs):
+            s = self.ds[i]
+            for buf, v in zip(bufs, (s[k] for k in self.keys) if self.keys is not None else s): buf[j] = v
+        return slot, len(idxs)
+    
+def _no_collate(b): return b
+
+# %% ../nbs/18_shared_loader.ipynb 6
+class RingDataLoader:
+    """
+        DataLoader whose workers write batches into a ring of preallocated,
+        reusable shared-memory slots, and send only slot indices to the main
+        process. Yields tuples of views into the slots.
+    """
+    def __init__(
+        self,
+        ds, # Map-style dataset of tuples or dicts of tensors/numbers with fixed shapes
+        batch_size, # Batch size
+        shuffle=False, # If true, the samples are shuffled every epoch
+        drop_last=False, # If true, the last incomplete batch is dropped
+        num_workers=0, # Number of worker processes
+        prefetch_factor=2, # Number of batches loaded in advance by each worker
+        keep=2, # Number of batches yielded earlier that the consumer may still hold
+        **kwargs # Passed on to the Pytorch DataLoader (except `pin_memory`)
+    ):
+        self.ds, self.batch_size = ds, batch_size
+        self.keys, fields = _fields(ds, ds[0])
+        self.n_slots = (num_workers * prefetch_factor if num_workers else 0) + 1 + keep
+        self.slots = [tuple(torch.empty(batch_size, *f.shape, dtype=f.dtype).share_memory_() for f in fields) for _ in range(self.n_slots)]
+        self.sampler = TaggedBatchSampler(RandomSampler(ds) if shuffle else SequentialSampler(ds), batch_size, drop_last)
+        self.dl = DataLoader(RingWriter(ds, self.slots, self.keys), batch_sampler=self.sampler, collate_fn=_no_collate, num_workers=num_workers, 
+                             prefetch_factor=prefetch_factor if num_workers else None, **kwargs)
+        
+    def __len__(self): return len(self.dl)
+    def __iter__(self):
+        for slot, n in self.dl: yield tuple(t[:n] for t in self.slots[slot])
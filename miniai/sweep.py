@@ -0,0 +1,160 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/12_sweep.ipynb.
+
+# %% auto 0
+__all__ = ['save_memmap', 'MemmapDataset', 'MedianPruner', 'PruneCB', 'SweepRunner', 'grid']
+
+# %% ../nbs/12_sweep.ipynb 2
+import math, os, time, torch, multiprocessing as mp
+import numpy as np
+import pandas as pd
+import fastcore.all as fc
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from torch.utils.data import Dataset
+
+from .learner import *
+
+# %% ../nbs/12_sweep.ipynb 5
+def save_memmap(
+    path, # Directory in which the splits are saved
+    **splits # Splits as tuples of tensors or arrays, e.g. `train=(x, y)`
+):
+    "Saves each split as `.npy` files that can be memory-mapped, and returns a dict of `MemmapDataset`s."
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, ts in splits.items():
+        for i, t in enumerate(ts): np.save(path/f'{name}_{i}.npy', np.asarray(t))
+    return {name: MemmapDataset(path, name) for name in splits}
+
+class MemmapDataset(Dataset):
+    """
+        Dataset of tuples read from memory-mapped `.npy` files written by
+        `save_memmap`. The files are opened lazily, so that the dataset can
+        be sent to other processes cheaply.
+    """
+    def __init__(self, path, split): self.path, self.split, self.arrays = Path(path), split, None
+        
+    def _open(self):
+        fnames = sorted(self.path.glob(f'{self.split}_*.npy'), key=lambda f: int(f.stem.split('_')[-1]))
+        self.arrays = [np.load(f, mmap_mode='r') for f in fnames]
+        
+    def __len__(self): 
+        if self.arrays is None: self._open()
+        return len(self.arrays[0])
+    
+    def __getitem__(self, i):
+        if self.arrays is None: self._open()
+        return tuple(torch.from_numpy(np.array(a[i])) for a in self.arrays)
+    
+    def __getstate__(self): return {**self.__dict__, 'arrays': None}
+
+# %% ../nbs/12_sweep.ipynb 7
+class MedianPruner:
+    "Prunes trials whose monitored metric is worse than the median of the other trials at the same epoch."
+    def __init__(
+        self,
+        monitor='Valid loss', # Column of the `MetricsCB` log that is compared
+        mode='min', # 'min' or 'max'
+        n_startup=4, # Minimum number of other trials that must have reached an epoch before pruning at that epoch
+        n_warmup=1 # Number of epochs of each trial that are never pruned
+    ):
+        fc.store_attr()
+        self.reports = {}
+        
+    def share(self, manager): self.reports = manager.dict()
+        
+    def should_prune(self, trial, epoch, value):
+        self.reports[(trial, epoch)] = value
+        if epoch < self.n_warmup: return False
+        if math.isnan(value): return True
+        others = [v for (t, e), v in self.reports.items() if e == epoch and t != trial and not math.isnan(v)]
+        if len(others) < self.n_startup: return False
+        median = np.median(others)
+        return value > median if self.mode == 'min' else value < median
+    
+class PruneCB(Callback):
+    "Reports the monitored metric to a pruner after each epoch, and cancels the fit if the trial is pruned."
+    order = MetricsCB.order + 1
+    def __init__(self, trial, pruner): self.trial, self.pruner, self.pruned = trial, pruner, False
+    def after_full_epoch(self):
+        value = float(self.learn.metrics.log[self.pruner.monitor].iloc[-1])
+        if self.pruner.should_prune(self.trial, self.learn.epoch, value):
+            self.pruned = True
+            raise CancelFitException()
+
+# %% ../nbs/12_sweep.ipynb 9
+_worker = {}
+
+def _init_worker(slots, data, threads, pruner):
+    cores = slots.get()
+    if hasattr(os, 'sched_setaffinity'): os.sched_setaffinity(0, cores)
+    torch.set_num_threads(threads)
+    _worker.update(data=data, pruner=pruner, cores=cores)
+    
+def _run_trial(trial_fn, i, cfg):
+    cbs = [PruneCB(i, _worker['pruner'])] if _worker['pruner'] is not None else []
+    start = time.perf_counter()
+    try:
+        res = trial_fn(cfg, _worker['data'], cbs)
+        if hasattr(res, 'metrics'): res = {**res.metrics.log.iloc[-1].to_dict(), 'epochs': res.epoch + 1}
+        status = 'pruned' if cbs and cbs[0].pruned else 'complete'
+    except Exception as e: res, status = {'error': repr(e)}, 'failed'
+    cfg = {k: getattr(v, '__name__', v) for k, v in cfg.items()} # <----- e.g. optimisers are recorded by name
+    return {'trial': i, **cfg, **res, 'status': status, 'time': time.perf_counter() - start, 'cores': len(_worker['cores'])}
+
+# %% ../nbs/12_sweep.ipynb 10
+class SweepRunner:
+    """
+        Runs the trials of a hyperparameter sweep in parallel processes pinned
+        to disjoint sets of cores, sharing memory-mapped datasets, and
+        gathers the results in a single table.
+    """
+    def __init__(
+        self,
+        trial_fn, # Function `trial_fn(config, data, cbs)` returning a `Learner` or a dict of results
+        data, # Dict of datasets shared by the trials, e.g. returned by `save_memmap`
+        n_procs=None, # Number of parallel trials, defaults to the number of cores divided by `threads`
+        threads=1, # Number of cores (and torch threads) of each trial
+        pruner=None, # Optional `MedianPruner`
+        results='sweep.csv', # Path of the results table
+        mp_context='fork' # Start method of the worker processes
+    ):
+        fc.store_attr()
+        self.cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count()))
+        if n_procs is None: self.n_procs = max(1, len(self.cores) // threads)
+        
+    def core_slots(self):
+        "Splits the available cores into one set of `threads` cores per worker, sharing cores if there are too few."
+        return [{self.cores[(i*self.threads + j) % len(self.cores)] for j in range(self.threads)} for i in range(self.n_procs)]
+        
+    def run(self, configs):
+        "Runs a trial for each config and returns the results table, also saved to `results`."
+        ctx = mp.get_context(self.mp_context)
+        with ctx.Manager() as manager:
+            slots = manager.Queue()
+            for s in self.core_slots(): slots.put(s)
+            if self.pruner is not None: self.pruner.share(manager)
+            rows, start = [], time.perf_counter()
+            with ProcessPoolExecutor(self.n_procs, mp_context=ctx, initializer=_init_worker, 
+                                     initargs=(slots, self.data, self.threads, self.pruner)) as ex:
+                futs = [ex.submit(_run_trial, self.trial_fn, i, cfg) for i, cfg in enumerate(configs)]
+                for fut in as_completed(futs):
+                    rows.append(fut.result())
+                    self._save(rows)
+        self.elapsed = time.perf_counter() - start
+        return self._table(rows)
+    
+    def _table(self, rows): return pd.DataFrame(rows).sort_values('trial').reset_index(drop=True)
+    
+    def _save(self, rows):
+        path = Path(self.results)
+        tmp = path.with_suffix('.tmp')
+        self._table(rows).to_csv(tmp, index=False)
+        os.replace(tmp, path)
+
+# %% ../nbs/12_sweep.ipynb 11
+def grid(**params):
+    "Returns the list of configs of the cartesian product of the values of `params`."
+    keys, cfgs = list(params), [{}]
+    for k in keys: cfgs = [{**c, k: v} for c in cfgs for v in params[k]]
+    return cfgs
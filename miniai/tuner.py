@@ -0,0 +1,194 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_tuner.ipynb.
+
+# %% auto 0
+__all__ = ['ThroughputCB', 'n_cpus', 'host_key', 'DataLoadersTuner']
+
+# %% ../nbs/09_tuner.ipynb 2
+import json, math, os, socket, time, torch
+from pathlib import Path
+import pandas as pd
+import fastcore.all as fc
+
+from .core import clean_gpu
+from .datasets import *
+from .learner import *
+
+# %% ../nbs/09_tuner.ipynb 5
+class ThroughputCB(Callback):
+    """
+        Times training steps after a warm-up and cancels the fit once
+        `n_steps` steps have been timed or `max_time` seconds have passed.
+        Records samples/sec and, on CUDA, the peak memory allocated (None
+        elsewhere).
+    """
+    order = 100 # <----- runs after every other callback, so whole steps are timed
+    def __init__(
+        self,
+        n_steps=20, # Number of timed training steps
+        warmup=3, # Number of untimed steps at the start
+        max_time=None # Maximum duration of the probe in seconds, warm-up included
+    ): 
+        fc.store_attr()
+        
+    def before_fit(self):
+        self.samples_per_sec, self.peak_mem, self.n, self.samples = math.nan, None, 0, 0
+        self.start = self.t0 = time.perf_counter()
+        if torch.cuda.is_available(): torch.cuda.reset_peak_memory_stats()
+            
+    def after_batch(self):
+        if not self.learn.model.training: return
+        if self.learn.iter + 1 == self.warmup: self._sync(); self.t0 = time.perf_counter()
+        elif self.learn.iter + 1 > self.warmup: self.n, self.samples = self.n + 1, self.samples + len(self.learn.xb)
+        if self.n == self.n_steps or (self.max_time and time.perf_counter() - self.start > self.max_time): self._finish()
+    
+    def after_epoch(self): 
+        if self.learn.model.training: self._finish() # <----- the loader ran out of batches
+        
+    def _sync(self): 
+        if torch.is_tensor(self.learn.loss): self.learn.loss.item()
+            
+    def _finish(self):
+        self._sync()
+        if self.n: self.samples_per_sec = self.samples / (time.perf_counter() - self.t0)
+        if self.learn.loss.is_cuda: self.peak_mem = torch.cuda.max_memory_allocated(self.learn.loss.device)
+        raise CancelFitException()
+
+# %% ../nbs/09_tuner.ipynb 7
+def n_cpus():
+    "Returns the number of CPUs available to this process."
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+
+def host_key(key=''):
+    "Identifies the host, the device and the setup being tuned, for caching results."
+    dev = torch.cuda.get_device_name() if torch.cuda.is_available() else 'cpu'
+    return f"{socket.gethostname()}|{dev}|{n_cpus()}cpus|{key}"
+
+# %% ../nbs/09_tuner.ipynb 8
+class DataLoadersTuner:
+    """
+        Searches for the batch size, number of loader workers, prefetch
+        factor and split of CPU threads between loader workers and compute
+        that give the highest training throughput, within a time budget.
+    """
+    def __init__(
+        self,
+        dd, # Dataset dict, as passed to `DataLoaders.from_dd`
+        get_learner, # Function taking a `DataLoaders` object and returning a fresh `Learner` (including a `DeviceCB` if needed)
+        min_bs=16, # Smallest batch size tried
+        max_bs=1024, # Largest batch size tried
+        max_time=60, # Time budget for the whole search, in seconds
+        n_steps=20, # Number of timed steps in each probe
+        warmup=3, # Number of untimed steps at the start of each probe
+        lr=1e-3, # Learning rate used in the probes
+        mem_frac=0.9, # Batch sizes with a peak memory above this fraction of the device memory are rejected
+        tol=0.05, # Relative drop in throughput below the best one that ends the batch size search
+        as_tuple=True, # Passed on to `DataLoaders.from_dd`
+        cache=None, # Path of a JSON file in which to cache the best configuration for each host
+        key='', # Extra key identifying what is tuned in the cache, e.g. the name of the model
+        verbose=True # If true, prints the result of each probe
+    ):
+        fc.store_attr()
+        self.records, self.best = [], None
+        
+    def probe(self, batch_size, num_workers, prefetch_factor=2, num_threads=None):
+        "Times a short training run with the given configuration and returns its record."
+        rec = dict(batch_size=batch_size, num_workers=num_workers, prefetch_factor=prefetch_factor if num_workers else None,
+                   num_threads=num_threads or torch.get_num_threads(), samples_per_sec=math.nan, peak_mem=None, error=None)
+        if any(all(r[k] == rec[k] for k in self.keys) for r in self.records): return None
+        remaining = self.deadline - time.perf_counter()
+        if remaining <= 0: return None
+        threads = torch.get_num_threads()
+        torch.set_num_threads(rec['num_threads'])
+        cb = ThroughputCB(self.n_steps, self.warmup, max_time=remaining)
+        try:
+            dls = DataLoaders.from_dd(self.dd, batch_size, self.as_tuple, num_workers, rec['prefetch_factor'], shuffle=True, drop_last=True)
+            learn = self.get_learner(dls)
+            learn.cbs = list(learn.cbs or []) + [cb]
+            cb.learn = learn
+            learn.fit(self.lr, 1)
+            rec.update(samples_per_sec=cb.samples_per_sec, peak_mem=cb.peak_mem)
+        except torch.cuda.OutOfMemoryError: rec['error'] = 'out of memory'
+        finally:
+            learn = dls = None
+            torch.set_num_threads(threads)
+            clean_gpu()
+        if self._over_mem(rec['peak_mem']): rec['error'] = 'memory budget'
+        self.records.append(rec)
+        if self.verbose: print(self._fmt(rec))
+        return rec
+    
+    keys = 'batch_size', 'num_workers', 'prefetch_factor', 'num_threads'
+    
+    def _over_mem(self, peak):
+        if peak is None: return False
+        return peak > self.mem_frac * torch.cuda.get_device_properties(0).total_memory
+        
+    def _fmt(self, rec):
+        res = rec['error'] or f"{rec['samples_per_sec']:.0f} samples/s"
+        if rec['peak_mem'] is not None: res += f", {rec['peak_mem']/2**20:.0f} MB"
+        return f"bs {rec['batch_size']}, workers {rec['num_workers']}, prefetch {rec['prefetch_factor']}, threads {rec['num_threads']}: {res}"
+    
+    def _best(self):
+        ok = [r for r in self.records if r['error'] is None and not math.isnan(r['samples_per_sec'])]
+        return max(ok, key=lambda r: r['samples_per_sec']) if ok else None
+    
+    def _search_bs(self, nw, nt):
+        n_train = len(next(iter(self.dd.values())))
+        bs, best = self.min_bs, 0.
+        while bs <= min(self.max_bs, n_train // (self.warmup + 1)):
+            rec = self.probe(bs, nw, 2, nt)
+            if rec is None or rec['error']: break
+            if rec['samples_per_sec'] < best * (1 - self.tol): break
+            best, bs = max(best, rec['samples_per_sec']), bs * 2
+            
+    def _search_workers(self, bs):
+        n, nw = n_cpus(), 0
+        while nw <= n:
+            self.probe(bs, nw, 2, max(1, n - nw))
+            nw = max(1, nw * 2)
+            
+    def _refine(self, best):
+        n, nw, bs = n_cpus(), best['num_workers'], best['batch_size']
+        if nw:
+            for pf in (4, 8): self.probe(bs, nw, pf, best['num_threads'])
+        best = self._best()
+        for nt in (n, max(1, best['num_threads'] // 2)): self.probe(bs, nw, best['prefetch_factor'] or 2, nt)
+            
+    def tune(self, refresh=False):
+        "Runs the search, or returns the cached configuration for this host unless `refresh` is true."
+        cache, hk = self._load_cache(), host_key(self.key)
+        if hk in cache and not refresh: 
+            self.best = cache[hk]
+            return self.best
+        self.deadline = time.perf_counter() + self.max_time
+        n = n_cpus()
+        nw = min(4, n // 2)
+        self._search_bs(nw, max(1, n - nw))
+        if self._best() is None: raise RuntimeError(f"No probe succeeded: {self.records[-1]['error'] if self.records else 'no time left'}")
+        self._search_workers(self._best()['batch_size'])
+        self._refine(self._best())
+        self.best = {k: v for k, v in self._best().items() if k != 'error'}
+        if self.cache is not None: self._save_cache({**cache, hk: self.best})
+        return self.best
+    
+    @property
+    def results(self): 
+        "Returns the records of every probe as a dataframe."
+        return pd.DataFrame(self.records)
+    
+    def dls(self, **kwargs):
+        "Sets the tuned number of threads and returns `DataLoaders` with the tuned configuration."
+        if self.best is None: self.tune()
+        torch.set_num_threads(self.best['num_threads'])
+        return DataLoaders.from_dd(self.dd, self.best['batch_size'], self.as_tuple, self.best['num_workers'], self.best['prefetch_factor'], **kwargs)
+    
+    def _load_cache(self):
+        if self.cache is None or not Path(self.cache).exists(): return {}
+        return json.loads(Path(self.cache).read_text())
+    
+    def _save_cache(self, cache):
+        path = Path(self.cache)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(cache, indent=2))
+        os.replace(tmp, path)
@@ -0,0 +1,135 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/20_zero.ipynb.
+
+# %% auto 0
+__all__ = ['partition', 'opt_state_bytes', 'ShardedOptimiser', 'run_distributed']
+
+# %% ../nbs/20_zero.ipynb 2
+import os, pickle, socket, time, torch, multiprocessing as mp
+import torch.distributed as dist
+import fastcore.all as fc
+
+from .learner import *
+from .accel import SGD
+
+# %% ../nbs/20_zero.ipynb 5
+def partition(params, world_size):
+    "Splits `params` into `world_size` lists with balanced numbers of elements, keeping the order of the parameters within each list."
+    sizes, shards = [0] * world_size, [[] for _ in range(world_size)]
+    for i in sorted(range(len(params)), key=lambda i: -params[i].numel()):
+        r = sizes.index(min(sizes))
+        shards[r].append(i)
+        sizes[r] += params[i].numel()
+    return [[params[i] for i in sorted(s)] for s in shards]
+
+# %% ../nbs/20_zero.ipynb 8
+def opt_state_bytes(opt):
+    "Bytes of optimiser state held by `opt`: a miniai optimiser (tensors stored on its parameters) or a `torch.optim` one."
+    if isinstance(opt, ShardedOptimiser): return opt_state_bytes(opt.opt)
+    if isinstance(opt, torch.optim.Optimizer): 
+        return sum(v.numel() * v.element_size() for s in opt.state.values() for v in s.values() if torch.is_tensor(v))
+    return sum(getattr(p, k).numel() * getattr(p, k).element_size() for p in opt.params for k in opt.state_keys if hasattr(p, k))
+
+class ShardedOptimiser:
+    """
+        ZeRO-1 style wrapper that keeps the state and update of only one
+        shard of the parameters on each data-parallel rank, and all-gathers
+        the updated parameters after each step.
+    """
+    def __init__(
+        self,
+        params, # Parameters of the model, the same on every rank
+        lr, # Learning rate, passed on to `opt_func`
+        opt_func=SGD, # Optimiser built on the shard of this rank, e.g. `Adam` or `torch.optim.AdamW`
+        group=None, # Process group, defaults to the global one
+        average_grads=True, # If true, gradients are averaged across ranks before the step (turn off if the model is wrapped in `DistributedDataParallel`)
+        shard=True, # If false, every rank updates all the parameters (the replicated baseline)
+        **kwargs # Passed on to `opt_func`
+    ):
+        self.params = [p for p in params if p.requires_grad]
+        self.group, self.average_grads, self.shard = group, average_grads, shard
+        self.distributed = dist.is_available() and dist.is_initialized()
+        self.rank = dist.get_rank(group) if self.distributed else 0
+        self.world_size = dist.get_world_size(group) if self.distributed else 1
+        self.shards = partition(self.params, self.world_size) if shard else [self.params] * self.world_size
+        self.local = self.shards[self.rank]
+        self.opt = opt_func(self.local, lr, **kwargs)
+        sizes = [sum(p.numel() for p in s) for s in self.shards]
+        self.gather_bufs = [self.params[0].new_empty(max(sizes)) for _ in range(self.world_size)] # <----- padded to the size of the largest shard
+        
+    def __getattr__(self, k): 
+        if k == 'opt': raise AttributeError(k)
+        return getattr(self.opt, k) # <----- hyperparameters, e.g. `lr` or `param_groups`, live in the wrapped optimiser
+    
+    @property
+    def lr(self): return self.opt.lr
+    @lr.setter
+    def lr(self, v): self.opt.lr = v
+        
+    @torch.no_grad()
+    def sync_grads(self):
+        "Averages the gradients of all the parameters across ranks, with a single all-reduce."
+        grads = [p.grad for p in self.params if p.grad is not None]
+        flat = torch.cat([g.reshape(-1) for g in grads])
+        dist.all_reduce(flat, group=self.group)
+        flat /= self.world_size
+        torch._foreach_copy_(grads, [t.view_as(g) for t, g in zip(flat.split([g.numel() for g in grads]), grads)])
+        
+    @torch.no_grad()
+    def gather_params(self):
+        "Sends the parameters of the shard of this rank to all ranks, and receives the others."
+        local = torch.cat([p.reshape(-1) for p in self.local]) if self.local else self.params[0].new_empty(0)
+        send = self.gather_bufs[self.rank].clone()
+        send[:local.numel()] = local
+        dist.all_gather(self.gather_bufs, send, group=self.group)
+        for r, (buf, ps) in enumerate(zip(self.gather_bufs, self.shards)):
+            if r == self.rank or not ps: continue
+            flat = buf[:sum(p.numel() for p in ps)].split([p.numel() for p in ps])
+            torch._foreach_copy_(ps, [t.view_as(p) for t, p in zip(flat, ps)])
+        
+    def step(self):
+        if self.distributed and self.average_grads: self.sync_grads()
+        self.opt.step()
+        if self.distributed and self.shard: self.gather_params()
+        
+    def zero_grad(self):
+        for p in self.params: 
+            if p.grad is not None: p.grad.zero_() # <----- all parameters, not only the shard of the wrapped optimiser
+        
+    def state_dict(self): 
+        "State of the shard of this rank only: each rank saves (and later loads) its own."
+        return {'rank': self.rank, 'world_size': self.world_size, 'opt': self.opt.state_dict()}
+    def load_state_dict(self, state): 
+        assert (state['rank'], state['world_size']) == (self.rank, self.world_size), 'the state belongs to another rank or world size'
+        self.opt.load_state_dict(state['opt'])
+
+# %% ../nbs/20_zero.ipynb 12
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _dist_worker(fn, rank, world_size, port, backend, q, args):
+    os.environ.update(MASTER_ADDR='127.0.0.1', MASTER_PORT=str(port))
+    torch.set_num_threads(1)
+    dist.init_process_group(backend, rank=rank, world_size=world_size)
+    try: q.put((rank, pickle.dumps(fn(rank, world_size, *args)))) # <----- plain pickling copies tensors, rather than sharing them with a process about to exit
+    except Exception as e: q.put((rank, pickle.dumps(e))); raise
+    finally: dist.destroy_process_group()
+    
+def run_distributed(
+    fn, # Function `fn(rank, world_size, *args)`, its result must be picklable
+    world_size=2, # Number of processes
+    *args, # Passed on to `fn`
+    backend='gloo', # Backend of the process group
+    mp_context='fork' # Start method of the processes
+):
+    "Runs `fn` in `world_size` processes joined in a process group, and returns their results, in rank order."
+    ctx = mp.get_context(mp_context)
+    q, port = ctx.Queue(), _free_port()
+    procs = [ctx.Process(target=_dist_worker, args=(fn, r, world_size, port, backend, q, args)) for r in range(world_size)]
+    for p in procs: p.start()
+    res = {r: pickle.loads(b) for r, b in (q.get() for _ in procs)}
+    for p in procs: p.join()
+    for r in range(world_size):
+        if isinstance(res[r], Exception): raise res[r]
+    return [res[r] for r in range(world_size)]